@@ -10,11 +10,20 @@ export async function GET(request: Request) {
     const sourceId = searchParams.get("sourceId");
     const limit = parseInt(searchParams.get("limit") || "100", 10);
 
+    // Only the listed fields: the content bodies and the processed item's
+    // embedding and extraction are large and not shown in the list
     let query = db
       .select({
-        content: schema.contentItems,
-        source: schema.sources,
-        processed: schema.processedItems,
+        id: schema.contentItems.id,
+        title: schema.contentItems.title,
+        author: schema.contentItems.author,
+        url: schema.contentItems.url,
+        publishedAt: schema.contentItems.publishedAt,
+        ingestedAt: schema.contentItems.ingestedAt,
+        sourceId: schema.sources.id,
+        sourceName: schema.sources.name,
+        sourceType: schema.sources.sourceType,
+        processedId: schema.processedItems.id,
       })
       .from(schema.contentItems)
       .leftJoin(schema.sources, eq(schema.contentItems.sourceId, schema.sources.id))
@@ -35,16 +44,17 @@ export async function GET(request: Request) {
     const results = await query;
 
     const items = results.map((row) => ({
-      id: row.content.id,
-      title: row.content.title,
-      author: row.content.author,
-      url: row.content.url,
-      publishedAt: row.content.publishedAt,
-      ingestedAt: row.content.ingestedAt,
-      source: row.source
-        ? { id: row.source.id, name: row.source.name, type: row.source.sourceType }
-        : null,
-      isProcessed: !!row.processed,
+      id: row.id,
+      title: row.title,
+      author: row.author,
+      url: row.url,
+      publishedAt: row.publishedAt,
+      ingestedAt: row.ingestedAt,
+      source:
+        row.sourceId !== null
+          ? { id: row.sourceId, name: row.sourceName, type: row.sourceType }
+          : null,
+      isProcessed: row.processedId !== null,
     }));
 
     return NextResponse.json({ items });
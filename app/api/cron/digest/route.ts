@@ -1,10 +1,13 @@
 import { NextResponse } from "next/server";
 import { db, schema } from "@/lib/db";
-import { eq } from "drizzle-orm";
+import { eq, sql } from "drizzle-orm";
 import { generateDigest, saveDigest } from "@/lib/services/digest";
 import { sendDigestToAll } from "@/lib/services/delivery/email";
 import { config } from "@/lib/config";
 
+// Generation can wait minutes on a synthesis batch
+export const maxDuration = 300;
+
 export async function GET(request: Request) {
   // Verify cron secret
   const authHeader = request.headers.get("authorization");
@@ -45,7 +48,7 @@ export async function GET(request: Request) {
           emailsFailed: emailResult.failed,
           emailErrors: emailResult.errors,
         },
-        completedAt: new Date(),
+        completedAt: sql`now()`,
       })
       .where(eq(schema.jobRuns.id, job.id));
 
@@ -64,7 +67,7 @@ export async function GET(request: Request) {
       .set({
         status: "failed",
         error: error instanceof Error ? error.message : "Unknown error",
-        completedAt: new Date(),
+        completedAt: sql`now()`,
       })
       .where(eq(schema.jobRuns.id, job.id));
 
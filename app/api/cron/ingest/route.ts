@@ -1,6 +1,6 @@
 import { NextResponse } from "next/server";
 import { db, schema } from "@/lib/db";
-import { eq } from "drizzle-orm";
+import { eq, sql } from "drizzle-orm";
 import { ingestAllSources } from "@/lib/services/ingestion";
 import { config } from "@/lib/config";
 
@@ -41,7 +41,7 @@ export async function GET(request: Request) {
           itemsFailed: totalFailed,
           errors,
         },
-        completedAt: new Date(),
+        completedAt: sql`now()`,
       })
       .where(eq(schema.jobRuns.id, job.id));
 
@@ -62,7 +62,7 @@ export async function GET(request: Request) {
       .set({
         status: "failed",
         error: error instanceof Error ? error.message : "Unknown error",
-        completedAt: new Date(),
+        completedAt: sql`now()`,
       })
       .where(eq(schema.jobRuns.id, job.id));
 
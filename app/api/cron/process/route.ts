@@ -1,6 +1,6 @@
 import { NextResponse } from "next/server";
 import { db, schema } from "@/lib/db";
-import { eq } from "drizzle-orm";
+import { eq, sql } from "drizzle-orm";
 import { processNewItems } from "@/lib/services/processing/pipeline";
 import { config } from "@/lib/config";
 
@@ -38,7 +38,7 @@ export async function GET(request: Request) {
           clustersCreated: result.clustersCreated,
           errors: result.errors,
         },
-        completedAt: new Date(),
+        completedAt: sql`now()`,
       })
       .where(eq(schema.jobRuns.id, job.id));
 
@@ -54,7 +54,7 @@ export async function GET(request: Request) {
       .set({
         status: "failed",
         error: error instanceof Error ? error.message : "Unknown error",
-        completedAt: new Date(),
+        completedAt: sql`now()`,
       })
       .where(eq(schema.jobRuns.id, job.id));
 
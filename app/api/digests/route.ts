@@ -1,10 +1,12 @@
 import { NextResponse } from "next/server";
 import { db, schema } from "@/lib/db";
-import { eq, desc } from "drizzle-orm";
-import { generateDigest, saveDigest } from "@/lib/services/digest";
+import { eq, desc, sql } from "drizzle-orm";
+import { generateDigest, getDigest, saveDigest } from "@/lib/services/digest";
 import { sendDigestToAll } from "@/lib/services/delivery/email";
 
 export const dynamic = "force-dynamic";
+// Generation can wait minutes on a synthesis batch
+export const maxDuration = 300;
 
 export async function GET(request: Request) {
   try {
@@ -12,21 +14,26 @@ export async function GET(request: Request) {
     const weekNumber = searchParams.get("weekNumber");
 
     if (weekNumber) {
-      const digest = await db
-        .select()
-        .from(schema.weeklyDigests)
-        .where(eq(schema.weeklyDigests.weekNumber, weekNumber))
-        .limit(1);
+      const { digest } = await getDigest(weekNumber);
 
-      if (digest.length === 0) {
+      if (!digest) {
         return NextResponse.json({ error: "Digest not found" }, { status: 404 });
       }
 
-      return NextResponse.json({ digest: digest[0] });
+      return NextResponse.json({ digest });
     }
 
+    // The list view only needs summary fields; skip the rendered content
+    // and digest payload, which are by far the largest columns
     const digests = await db
-      .select()
+      .select({
+        id: schema.weeklyDigests.id,
+        weekNumber: schema.weeklyDigests.weekNumber,
+        dateRange: schema.weeklyDigests.dateRange,
+        sourcesCount: schema.weeklyDigests.sourcesCount,
+        itemsCount: schema.weeklyDigests.itemsCount,
+        generatedAt: schema.weeklyDigests.generatedAt,
+      })
       .from(schema.weeklyDigests)
       .orderBy(desc(schema.weeklyDigests.generatedAt));
 
@@ -78,7 +85,7 @@ export async function POST(request: Request) {
             themesCount: content.themes.length,
             sourcesCount: content.sourceIndex.length,
           },
-          completedAt: new Date(),
+          completedAt: sql`now()`,
         })
         .where(eq(schema.jobRuns.id, job.id));
 
@@ -95,7 +102,7 @@ export async function POST(request: Request) {
         .set({
           status: "failed",
           error: error instanceof Error ? error.message : "Unknown error",
-          completedAt: new Date(),
+          completedAt: sql`now()`,
         })
         .where(eq(schema.jobRuns.id, job.id));
 
@@ -1,6 +1,6 @@
 import { NextResponse } from "next/server";
 import { db, schema } from "@/lib/db";
-import { eq } from "drizzle-orm";
+import { eq, sql } from "drizzle-orm";
 import { ingestAllSources } from "@/lib/services/ingestion";
 
 export async function POST() {
@@ -32,7 +32,7 @@ export async function POST() {
           itemsFailed: totalFailed,
           errors,
         },
-        completedAt: new Date(),
+        completedAt: sql`now()`,
       })
       .where(eq(schema.jobRuns.id, job.id));
 
@@ -54,7 +54,7 @@ export async function POST() {
       .set({
         status: "failed",
         error: error instanceof Error ? error.message : "Unknown error",
-        completedAt: new Date(),
+        completedAt: sql`now()`,
       })
       .where(eq(schema.jobRuns.id, job.id));
 
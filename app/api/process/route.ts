@@ -1,6 +1,6 @@
 import { NextResponse } from "next/server";
 import { db, schema } from "@/lib/db";
-import { eq } from "drizzle-orm";
+import { eq, sql } from "drizzle-orm";
 import { processNewItems } from "@/lib/services/processing/pipeline";
 
 export async function POST(request: Request) {
@@ -33,7 +33,7 @@ export async function POST(request: Request) {
           clustersCreated: result.clustersCreated,
           errors: result.errors,
         },
-        completedAt: new Date(),
+        completedAt: sql`now()`,
       })
       .where(eq(schema.jobRuns.id, job.id));
 
@@ -49,7 +49,7 @@ export async function POST(request: Request) {
       .set({
         status: "failed",
         error: error instanceof Error ? error.message : "Unknown error",
-        completedAt: new Date(),
+        completedAt: sql`now()`,
       })
       .where(eq(schema.jobRuns.id, job.id));
 
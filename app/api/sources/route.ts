@@ -3,6 +3,8 @@ import { db, schema } from "@/lib/db";
 
 export const dynamic = "force-dynamic";
 
+const SOURCE_TYPES: ReadonlySet<string> = new Set(["substack", "youtube", "gmail"]);
+
 export async function GET() {
   try {
     const sources = await db.select().from(schema.sources);
@@ -27,7 +29,7 @@ export async function POST(request: Request) {
       );
     }
 
-    if (!["substack", "youtube", "gmail"].includes(sourceType)) {
+    if (!SOURCE_TYPES.has(sourceType)) {
       return NextResponse.json(
         { error: "Invalid sourceType. Must be substack, youtube, or gmail" },
         { status: 400 }
@@ -6,22 +6,21 @@ export const dynamic = "force-dynamic";
 
 export async function GET() {
   try {
-    // Get counts using raw SQL for efficiency
-    const [sourcesCount] = await db
-      .select({ count: sql<number>`count(*)` })
-      .from(schema.sources);
-
-    const [contentCount] = await db
-      .select({ count: sql<number>`count(*)` })
-      .from(schema.contentItems);
-
-    const [processedCount] = await db
-      .select({ count: sql<number>`count(*)` })
-      .from(schema.processedItems);
-
-    const [digestsCount] = await db
-      .select({ count: sql<number>`count(*)` })
-      .from(schema.weeklyDigests);
+    // Get all counts in a single round trip
+    const {
+      rows: [counts],
+    } = await db.execute<{
+      sources: number;
+      contentItems: number;
+      processedItems: number;
+      digests: number;
+    }>(sql`
+      SELECT
+        (SELECT count(*) FROM ${schema.sources})::int AS "sources",
+        (SELECT count(*) FROM ${schema.contentItems})::int AS "contentItems",
+        (SELECT count(*) FROM ${schema.processedItems})::int AS "processedItems",
+        (SELECT count(*) FROM ${schema.weeklyDigests})::int AS "digests"
+    `);
 
     // Get recent jobs
     const recentJobs = await db
@@ -32,10 +31,10 @@ export async function GET() {
 
     return NextResponse.json({
       stats: {
-        sources: sourcesCount?.count || 0,
-        contentItems: contentCount?.count || 0,
-        processedItems: processedCount?.count || 0,
-        digests: digestsCount?.count || 0,
+        sources: counts?.sources || 0,
+        contentItems: counts?.contentItems || 0,
+        processedItems: counts?.processedItems || 0,
+        digests: counts?.digests || 0,
       },
       recentJobs,
     });
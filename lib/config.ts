@@ -20,9 +20,28 @@ function getEnvVarNumber(key: string, defaultValue: number): number {
   return parsed;
 }
 
+// Memoize a value derived from an env var on the raw string, so repeated
+// calls skip re-parsing but still see changes to the variable.
+function memoizeOnEnv<T>(
+  key: string,
+  parse: (value: string | undefined) => T
+): () => T {
+  let cached: { raw: string | undefined; value: T } | null = null;
+  return () => {
+    const raw = process.env[key];
+    if (!cached || cached.raw !== raw) {
+      cached = { raw, value: parse(raw) };
+    }
+    return cached.value;
+  };
+}
+
 export const config = {
   // Database
   databaseUrl: () => getEnvVar("DATABASE_URL"),
+  // Optional: DB_LOG_QUERIES=1 logs every SQL statement, to check how many
+  // queries a request issues. Off when unset or any other value.
+  dbLogQueries: getEnvVarOptional("DB_LOG_QUERIES") === "1",
 
   // AI APIs
   anthropicApiKey: () => getEnvVar("ANTHROPIC_API_KEY"),
@@ -40,18 +59,28 @@ export const config = {
   claudeModel: getEnvVar("CLAUDE_MODEL", "claude-sonnet-4-20250514"),
   embeddingModel: getEnvVar("EMBEDDING_MODEL", "text-embedding-3-small"),
   embeddingDimension: 1536,
+  // Optional client-side budget for Anthropic calls. Set these a little
+  // below the account's rate limits (ANTHROPIC_REQUESTS_PER_MINUTE, e.g. 40,
+  // and ANTHROPIC_INPUT_TOKENS_PER_MINUTE, e.g. 32000 on tier 1) to pace
+  // calls instead of hitting 429s. Unset or 0 leaves that limit off.
+  anthropicRequestsPerMinute: getEnvVarNumber("ANTHROPIC_REQUESTS_PER_MINUTE", 0),
+  anthropicInputTokensPerMinute: getEnvVarNumber(
+    "ANTHROPIC_INPUT_TOKENS_PER_MINUTE",
+    0
+  ),
 
   // Thresholds
   fingerprintThreshold: getEnvVarNumber("FINGERPRINT_THRESHOLD", 0.8),
   semanticThreshold: getEnvVarNumber("SEMANTIC_THRESHOLD", 0.85),
   noveltyWeeks: getEnvVarNumber("NOVELTY_WEEKS", 4),
+  // Clusters needing synthesis before it goes through the Message Batches API
+  synthesisBatchMinClusters: getEnvVarNumber("SYNTHESIS_BATCH_MIN_CLUSTERS", 20),
 
   // Email Configuration
   emailFrom: getEnvVar("EMAIL_FROM", "Weekly Intel <digest@yourdomain.com>"),
-  emailRecipients: () => {
-    const recipients = getEnvVarOptional("EMAIL_RECIPIENTS");
-    return recipients ? recipients.split(",").map((r) => r.trim()) : [];
-  },
+  emailRecipients: memoizeOnEnv("EMAIL_RECIPIENTS", (recipients) =>
+    recipients ? recipients.split(",").map((r) => r.trim()) : []
+  ),
 
   // Security
   cronSecret: () => getEnvVarOptional("CRON_SECRET"),
@@ -1,23 +1,44 @@
 import { neon } from "@neondatabase/serverless";
 import { drizzle } from "drizzle-orm/neon-http";
+import { config } from "@/lib/config";
 import * as schema from "./schema";
 
-function createDb() {
+type Database = ReturnType<typeof drizzle<typeof schema>>;
+
+function createDb(): Database | null {
   const url = process.env.DATABASE_URL;
-  if (!url) {
-    // Return a proxy that throws helpful errors during build time
-    return new Proxy({} as ReturnType<typeof drizzle<typeof schema>>, {
-      get(_target, prop) {
-        if (prop === "then" || prop === "catch") return undefined;
-        return () => {
-          throw new Error("DATABASE_URL is not configured");
-        };
-      },
-    });
-  }
+  if (!url) return null;
   const sql = neon(url);
-  return drizzle(sql, { schema });
+  return drizzle(sql, { schema, logger: config.dbLogQueries });
+}
+
+// Return a proxy that throws helpful errors during build time
+const unconfiguredDb = new Proxy({} as Database, {
+  get(_target, prop) {
+    if (prop === "then" || prop === "catch") return undefined;
+    return () => {
+      throw new Error("DATABASE_URL is not configured");
+    };
+  },
+});
+
+let instance: Database | null = null;
+
+function getDb(): Database {
+  if (!instance) {
+    instance = createDb();
+  }
+  return instance ?? unconfiguredDb;
 }
 
-export const db = createDb();
+// The client is created on first use rather than at import, so importing
+// this module (e.g. while building pages) has no side effects
+export const db = new Proxy({} as Database, {
+  get(_target, prop) {
+    const target = getDb();
+    const value = Reflect.get(target, prop, target);
+    return typeof value === "function" ? value.bind(target) : value;
+  },
+});
+
 export { schema };
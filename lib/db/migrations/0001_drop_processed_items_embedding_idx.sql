@@ -0,0 +1,3 @@
+-- Novelty search ranks the processed_at window exactly; the HNSW index
+-- returned too few in-window neighbours once history outgrew ef_search.
+DROP INDEX IF EXISTS processed_items_embedding_idx;
@@ -0,0 +1,7 @@
+-- Cluster syntheses keyed by a hash of prompt version, model and members
+CREATE TABLE IF NOT EXISTS synthesis_cache (
+  key varchar(64) PRIMARY KEY,
+  theme_name varchar(255) NOT NULL,
+  synthesized_summary text NOT NULL,
+  created_at timestamp DEFAULT now() NOT NULL
+);
@@ -0,0 +1,3 @@
+-- Hash of a digest's content, used to skip rewriting unchanged digests
+ALTER TABLE weekly_digests
+  ADD COLUMN IF NOT EXISTS content_hash varchar(64);
@@ -0,0 +1,4 @@
+-- HTTP cache validators for conditional feed fetches
+ALTER TABLE sources
+  ADD COLUMN IF NOT EXISTS feed_etag varchar(255),
+  ADD COLUMN IF NOT EXISTS feed_last_modified varchar(64);
@@ -0,0 +1,4 @@
+-- MinHash fingerprints move from JSON text to raw bytes. Old values can't
+-- be converted in place, so they're cleared and the pipeline recomputes them.
+ALTER TABLE content_items
+  ALTER COLUMN fingerprint TYPE bytea USING NULL;
@@ -0,0 +1,4 @@
+-- Embeddings are stored as 16-bit halfvec (pgvector >= 0.7); the novelty
+-- query compares against ::halfvec, which has no operator for vector columns
+ALTER TABLE processed_items
+  ALTER COLUMN embedding TYPE halfvec(1536) USING embedding::halfvec(1536);
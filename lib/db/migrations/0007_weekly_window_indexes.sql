@@ -0,0 +1,8 @@
+-- Range scans for the weekly processing/digest windows, the newest-first
+-- content list and the novelty lookback
+CREATE INDEX IF NOT EXISTS content_items_ingested_at_idx
+  ON content_items (ingested_at);
+CREATE INDEX IF NOT EXISTS content_items_source_ingested_at_idx
+  ON content_items (source_id, ingested_at);
+CREATE INDEX IF NOT EXISTS processed_items_processed_at_idx
+  ON processed_items (processed_at);
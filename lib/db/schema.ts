@@ -14,16 +14,44 @@ import {
 } from "drizzle-orm/pg-core";
 import { relations } from "drizzle-orm";
 
-// Custom pgvector type for embeddings
+// Custom pgvector type for embeddings. Stored as halfvec (16-bit floats,
+// pgvector >= 0.7), which halves storage and index size; the precision loss
+// doesn't matter for cosine similarity.
 export const vector = customType<{ data: number[]; driverData: string }>({
   dataType() {
-    return "vector(1536)";
+    return "halfvec(1536)";
   },
   toDriver(value: number[]): string {
     return `[${value.join(",")}]`;
   },
   fromDriver(value: string): number[] {
-    return value.slice(1, -1).split(",").map(Number);
+    // pgvector's text form ("[0.1,0.2,...]") is a valid JSON array, and the
+    // native JSON parser is much faster than splitting and mapping strings
+    return JSON.parse(value);
+  },
+});
+
+// MinHash signatures (128 uint32 values) stored as 512 raw bytes, about a
+// third of the size of the equivalent JSON
+export const minhash = customType<{
+  data: Uint32Array;
+  driverData: string | Uint8Array;
+}>({
+  dataType() {
+    return "bytea";
+  },
+  toDriver(value: Uint32Array): string {
+    const bytes = Buffer.from(value.buffer, value.byteOffset, value.byteLength);
+    return `\\x${bytes.toString("hex")}`;
+  },
+  fromDriver(value: string | Uint8Array): Uint32Array {
+    const bytes =
+      typeof value === "string" ? Buffer.from(value.slice(2), "hex") : value;
+    // Copy so the view starts on a 4-byte boundary, which driver buffers
+    // don't guarantee
+    const aligned = new Uint8Array(bytes.byteLength);
+    aligned.set(bytes);
+    return new Uint32Array(aligned.buffer);
   },
 });
 
@@ -34,6 +62,9 @@ export const sources = pgTable("sources", {
   sourceType: varchar("source_type", { length: 50 }).notNull(), // "substack" | "gmail" | "youtube"
   config: jsonb("config").default({}).notNull(),
   active: boolean("active").default(true).notNull(),
+  // HTTP cache validators from the last full fetch of a feed source
+  feedEtag: varchar("feed_etag", { length: 255 }),
+  feedLastModified: varchar("feed_last_modified", { length: 64 }),
   createdAt: timestamp("created_at").defaultNow().notNull(),
   updatedAt: timestamp("updated_at").defaultNow().notNull(),
 });
@@ -54,7 +85,7 @@ export const contentItems = pgTable(
     url: varchar("url", { length: 2048 }),
     publishedAt: timestamp("published_at"),
     ingestedAt: timestamp("ingested_at").defaultNow().notNull(),
-    fingerprint: varchar("fingerprint", { length: 512 }),
+    fingerprint: minhash("fingerprint"),
   },
   (table) => [
     uniqueIndex("content_items_source_external_idx").on(
@@ -63,28 +94,44 @@ export const contentItems = pgTable(
     ),
     index("content_items_published_at_idx").on(table.publishedAt),
     index("content_items_fingerprint_idx").on(table.fingerprint),
+    // Weekly processing/digest windows and the newest-first content list
+    index("content_items_ingested_at_idx").on(table.ingestedAt),
+    index("content_items_source_ingested_at_idx").on(
+      table.sourceId,
+      table.ingestedAt
+    ),
   ]
 );
 
 // Processed items - AI-extracted data with embeddings
-export const processedItems = pgTable("processed_items", {
-  id: serial("id").primaryKey(),
-  contentItemId: integer("content_item_id")
-    .references(() => contentItems.id)
-    .unique()
-    .notNull(),
-  summary: text("summary"),
-  keyInformation: jsonb("key_information").$type<string[]>(),
-  themes: jsonb("themes").$type<string[]>(),
-  hotTakes: jsonb("hot_takes").$type<{ take: string; context: string }[]>(),
-  entities: jsonb("entities").$type<{
-    people?: string[];
-    companies?: string[];
-    technologies?: string[];
-  }>(),
-  embedding: vector("embedding"),
-  processedAt: timestamp("processed_at").defaultNow().notNull(),
-});
+export const processedItems = pgTable(
+  "processed_items",
+  {
+    id: serial("id").primaryKey(),
+    contentItemId: integer("content_item_id")
+      .references(() => contentItems.id)
+      .unique()
+      .notNull(),
+    summary: text("summary"),
+    keyInformation: jsonb("key_information").$type<string[]>(),
+    themes: jsonb("themes").$type<string[]>(),
+    hotTakes: jsonb("hot_takes").$type<{ take: string; context: string }[]>(),
+    entities: jsonb("entities").$type<{
+      people?: string[];
+      companies?: string[];
+      technologies?: string[];
+    }>(),
+    embedding: vector("embedding"),
+    processedAt: timestamp("processed_at").defaultNow().notNull(),
+  },
+  (table) => [
+    // Novelty checks only look back over recently processed items, and
+    // rank that window exactly. There is deliberately no HNSW index on
+    // embedding: pgvector filters an index scan's ef_search candidates after
+    // the fact, so items outside the window would crowd out the ones in it.
+    index("processed_items_processed_at_idx").on(table.processedAt),
+  ]
+);
 
 // Story clusters - grouped related stories
 export const storyClusters = pgTable(
@@ -123,6 +170,15 @@ export const clusterMembers = pgTable(
   ]
 );
 
+// Synthesis cache - cluster syntheses keyed by a hash of prompt version,
+// model and members
+export const synthesisCache = pgTable("synthesis_cache", {
+  key: varchar("key", { length: 64 }).primaryKey(),
+  themeName: varchar("theme_name", { length: 255 }).notNull(),
+  synthesizedSummary: text("synthesized_summary").notNull(),
+  createdAt: timestamp("created_at").defaultNow().notNull(),
+});
+
 // Weekly digests - generated summaries
 export const weeklyDigests = pgTable(
   "weekly_digests",
@@ -135,6 +191,7 @@ export const weeklyDigests = pgTable(
     markdownContent: text("markdown_content"),
     htmlContent: text("html_content"),
     digestData: jsonb("digest_data"),
+    contentHash: varchar("content_hash", { length: 64 }),
     generatedAt: timestamp("generated_at").defaultNow().notNull(),
   },
   () => []
@@ -186,12 +243,13 @@ export const sourcesRelations = relations(sources, ({ many }) => ({
 
 export const contentItemsRelations = relations(
   contentItems,
-  ({ one, many }) => ({
+  ({ one }) => ({
     source: one(sources, {
       fields: [contentItems.sourceId],
       references: [sources.id],
     }),
-    processedItem: many(processedItems),
+    // content_item_id is unique, so each content item has at most one
+    processedItem: one(processedItems),
   })
 );
 
@@ -0,0 +1,44 @@
+import type Anthropic from "@anthropic-ai/sdk";
+import { config } from "@/lib/config";
+import { RateLimiter } from "./concurrency";
+
+let anthropicClient: Anthropic | null = null;
+
+// The SDK is imported on first use so routes that only read stored data
+// don't pay for loading it.
+export async function getAnthropic(): Promise<Anthropic> {
+  if (!anthropicClient) {
+    const { default: AnthropicClient } = await import("@anthropic-ai/sdk");
+    anthropicClient = new AnthropicClient({
+      apiKey: config.anthropicApiKey(),
+    });
+  }
+  return anthropicClient;
+}
+
+// Rough input-token estimate (~4 characters per token), good enough for
+// pacing requests without an extra count_tokens round trip.
+export function estimateTokens(text: string): number {
+  return Math.ceil(text.length / 4);
+}
+
+let rateLimiter: RateLimiter | null = null;
+
+// Wait until the shared budget has room for one more Messages API call of
+// roughly `estimatedTokens` input tokens. Without a configured budget this
+// returns straight away.
+export async function acquireAnthropicCapacity(
+  estimatedTokens: number
+): Promise<void> {
+  if (
+    config.anthropicRequestsPerMinute <= 0 &&
+    config.anthropicInputTokensPerMinute <= 0
+  ) {
+    return;
+  }
+  rateLimiter ??= new RateLimiter(
+    Math.max(0, config.anthropicRequestsPerMinute),
+    Math.max(0, config.anthropicInputTokensPerMinute)
+  );
+  return rateLimiter.acquire(estimatedTokens);
+}
@@ -0,0 +1,132 @@
+// Run `fn` over `items` with at most `limit` calls in flight. Results keep
+// the order of `items`, regardless of completion order.
+export async function mapWithConcurrency<T, R>(
+  items: readonly T[],
+  limit: number,
+  fn: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+  const results = new Array<R>(items.length);
+  let next = 0;
+
+  async function worker() {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await fn(items[index], index);
+    }
+  }
+
+  const workerCount = Math.max(1, Math.min(limit, items.length));
+  await Promise.all(Array.from({ length: workerCount }, worker));
+
+  return results;
+}
+
+// Create a limiter that lets at most `limit` calls sharing the same key run
+// at once. Calls over the limit wait for a slot in arrival order; calls with
+// different keys never wait on each other.
+export function createKeyedLimiter(limit: number) {
+  const active = new Map<string, number>();
+  const waiting = new Map<string, Array<() => void>>();
+
+  return async function run<R>(key: string, fn: () => Promise<R>): Promise<R> {
+    const running = active.get(key) ?? 0;
+    if (running >= limit) {
+      // The finishing call hands its slot straight to us
+      await new Promise<void>((resolve) => {
+        const queue = waiting.get(key) ?? [];
+        queue.push(resolve);
+        waiting.set(key, queue);
+      });
+    } else {
+      active.set(key, running + 1);
+    }
+
+    try {
+      return await fn();
+    } finally {
+      const queue = waiting.get(key);
+      const next = queue?.shift();
+      if (queue?.length === 0) waiting.delete(key);
+
+      if (next) {
+        next();
+      } else if (active.get(key) === 1) {
+        active.delete(key);
+      } else {
+        active.set(key, active.get(key)! - 1);
+      }
+    }
+  };
+}
+
+// Requests (and optionally tokens) are each a bucket holding one period's
+// allowance that refills continuously; an allowance of 0 leaves that
+// dimension unlimited. Callers of acquire() are served in arrival order, so
+// concurrent fan-out turns into a steady request rate instead of a burst of
+// 429s. A request larger than the whole token bucket is let through once the
+// bucket is full rather than waiting forever.
+export class RateLimiter {
+  private requests: number;
+  private tokens: number;
+  private updatedAt = Date.now();
+  private queue: Promise<void> = Promise.resolve();
+
+  constructor(
+    private readonly requestsPerPeriod: number,
+    private readonly tokensPerPeriod = 0,
+    private readonly periodMs = 60_000
+  ) {
+    this.requests = requestsPerPeriod;
+    this.tokens = tokensPerPeriod;
+  }
+
+  // Wait until there is room for one more request of `tokens` tokens
+  acquire(tokens = 0): Promise<void> {
+    const turn = this.queue.then(() => this.waitForCapacity(tokens));
+    this.queue = turn.catch(() => {});
+    return turn;
+  }
+
+  private async waitForCapacity(tokens: number): Promise<void> {
+    for (;;) {
+      const wait = this.reserve(tokens);
+      if (wait === 0) return;
+      await new Promise((resolve) => setTimeout(resolve, wait));
+    }
+  }
+
+  // Take capacity for one request and return 0, or return how many
+  // milliseconds to wait before trying again.
+  private reserve(estimatedTokens: number): number {
+    const now = Date.now();
+    const elapsedPeriods = (now - this.updatedAt) / this.periodMs;
+    this.updatedAt = now;
+    this.requests = Math.min(
+      this.requestsPerPeriod,
+      this.requests + elapsedPeriods * this.requestsPerPeriod
+    );
+    this.tokens = Math.min(
+      this.tokensPerPeriod,
+      this.tokens + elapsedPeriods * this.tokensPerPeriod
+    );
+
+    const requestsNeeded = this.requestsPerPeriod > 0 ? 1 : 0;
+    const tokensNeeded = Math.min(estimatedTokens, this.tokensPerPeriod);
+    if (this.requests >= requestsNeeded && this.tokens >= tokensNeeded) {
+      this.requests -= requestsNeeded;
+      this.tokens -= tokensNeeded;
+      return 0;
+    }
+
+    const requestWait =
+      this.requests < requestsNeeded
+        ? ((requestsNeeded - this.requests) / this.requestsPerPeriod) *
+          this.periodMs
+        : 0;
+    const tokenWait =
+      this.tokens < tokensNeeded
+        ? ((tokensNeeded - this.tokens) / this.tokensPerPeriod) * this.periodMs
+        : 0;
+    return Math.ceil(Math.max(requestWait, tokenWait, 1));
+  }
+}
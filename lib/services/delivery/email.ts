@@ -1,27 +1,44 @@
-import { Resend } from "resend";
+import type { Resend } from "resend";
 import { db, schema } from "@/lib/db";
-import { eq } from "drizzle-orm";
+import { eq, sql } from "drizzle-orm";
 import { config } from "@/lib/config";
+import { mapWithConcurrency, RateLimiter } from "../concurrency";
 import { renderHtml, renderPlainText } from "../digest/renderer";
 import type { DigestContent } from "../digest/generator";
 
 let resendClient: Resend | null = null;
 
-function getResend(): Resend {
+async function getResend(): Promise<Resend> {
   const apiKey = config.resendApiKey();
   if (!apiKey) {
     throw new Error("RESEND_API_KEY is not configured");
   }
   if (!resendClient) {
-    resendClient = new Resend(apiKey);
+    const { Resend: ResendClient } = await import("resend");
+    resendClient = new ResendClient(apiKey);
   }
   return resendClient;
 }
 
+// Resend accepts at most 100 emails per batch request
+const BATCH_SIZE = 100;
+// Batch requests in flight at once
+const BATCH_CONCURRENCY = 2;
+// Parallel single sends when falling back from the batch endpoint
+const SEND_CONCURRENCY = 8;
+// Attempts for a batch that keeps getting rate limited
+const RATE_LIMITED_ATTEMPTS = 5;
+
+// Resend's default rate limit is 2 requests per second per team. Every API
+// call, batch or single, waits for a slot, so the concurrency caps above
+// only bound how many requests are in flight.
+const resendLimiter = new RateLimiter(2, 0, 1000);
+
 interface SendResult {
   success: boolean;
   messageId?: string;
   error?: string;
+  rateLimited?: boolean;
 }
 
 async function sleep(ms: number): Promise<void> {
@@ -35,10 +52,11 @@ export async function sendEmailWithRetry(
   text: string,
   maxAttempts = 3
 ): Promise<SendResult> {
-  const resend = getResend();
+  const resend = await getResend();
 
   for (let attempt = 1; attempt <= maxAttempts; attempt++) {
     try {
+      await resendLimiter.acquire();
       const result = await resend.emails.send({
         from: config.emailFrom,
         to,
@@ -72,25 +90,109 @@ export async function sendEmailWithRetry(
   return { success: false, error: "Max attempts reached" };
 }
 
-export async function sendDigestEmail(
-  digestId: number,
-  recipient: string
-): Promise<SendResult> {
-  // Get digest
-  const digest = await db
-    .select()
+export async function sendBatchWithRetry(
+  recipients: string[],
+  subject: string,
+  html: string,
+  text: string,
+  maxAttempts = 3
+): Promise<SendResult[]> {
+  const resend = await getResend();
+
+  // Rate-limited attempts get a longer allowance than other failures, since
+  // waiting them out is all it takes
+  for (let attempt = 1; ; attempt++) {
+    let rateLimited = false;
+    try {
+      await resendLimiter.acquire();
+      const result = await resend.batch.send(
+        recipients.map((to) => ({
+          from: config.emailFrom,
+          to,
+          subject,
+          html,
+          text,
+        }))
+      );
+
+      if (result.error) {
+        rateLimited = result.error.name === "rate_limit_exceeded";
+        throw new Error(result.error.message);
+      }
+
+      // Ids come back in the same order as the submitted emails
+      const sent = result.data?.data ?? [];
+      return recipients.map((_, i) => ({
+        success: true,
+        messageId: sent[i]?.id,
+      }));
+    } catch (error) {
+      const attempts = rateLimited
+        ? Math.max(maxAttempts, RATE_LIMITED_ATTEMPTS)
+        : maxAttempts;
+      if (attempt >= attempts) {
+        const message =
+          error instanceof Error ? error.message : "Unknown error";
+        return recipients.map(() => ({
+          success: false,
+          error: message,
+          rateLimited,
+        }));
+      }
+
+      // Exponential backoff: 2^attempt seconds
+      const waitTime = Math.pow(2, attempt) * 1000;
+      await sleep(waitTime);
+    }
+  }
+}
+
+// Only the columns needed for the email; the markdown copy is skipped
+function prepareDigestEmailQuery() {
+  return db
+    .select({
+      weekNumber: schema.weeklyDigests.weekNumber,
+      htmlContent: schema.weeklyDigests.htmlContent,
+      digestData: schema.weeklyDigests.digestData,
+    })
     .from(schema.weeklyDigests)
-    .where(eq(schema.weeklyDigests.id, digestId))
-    .limit(1);
+    .where(eq(schema.weeklyDigests.id, sql.placeholder("digestId")))
+    .limit(1)
+    .prepare("digest_email");
+}
+
+let digestEmailQuery: ReturnType<typeof prepareDigestEmailQuery> | null =
+  null;
+
+// Build the email bodies for a digest once per send. The HTML is rendered
+// when the digest is saved, so the stored copy is reused when present.
+async function loadDigestEmail(
+  digestId: number
+): Promise<{ subject: string; html: string; text: string } | null> {
+  digestEmailQuery ??= prepareDigestEmailQuery();
+  const digest = await digestEmailQuery.execute({ digestId });
 
   if (digest.length === 0) {
-    return { success: false, error: "Digest not found" };
+    return null;
   }
 
   const digestData = digest[0].digestData as DigestContent;
-  const html = renderHtml(digestData);
-  const text = renderPlainText(digestData);
-  const subject = `Weekly Intel - ${digest[0].weekNumber}`;
+  return {
+    subject: `Weekly Intel - ${digest[0].weekNumber}`,
+    html: digest[0].htmlContent ?? renderHtml(digestData),
+    text: renderPlainText(digestData),
+  };
+}
+
+export async function sendDigestEmail(
+  digestId: number,
+  recipient: string
+): Promise<SendResult> {
+  const email = await loadDigestEmail(digestId);
+  if (!email) {
+    return { success: false, error: "Digest not found" };
+  }
+  const { subject, html, text } = email;
 
   // Create email log entry
   const [emailLog] = await db
@@ -113,7 +215,7 @@ export async function sendDigestEmail(
       status: result.success ? "sent" : "failed",
       providerMessageId: result.messageId || null,
       attempts: 1,
-      lastAttemptAt: new Date(),
+      lastAttemptAt: sql`now()`,
       errorMessage: result.error || null,
     })
     .where(eq(schema.emailLogs.id, emailLog.id));
@@ -132,15 +234,67 @@ export async function sendDigestToAll(
     return results;
   }
 
-  for (const recipient of recipients) {
-    const result = await sendDigestEmail(digestId, recipient);
-    if (result.success) {
-      results.sent++;
-    } else {
-      results.failed++;
-      results.errors.push(`Failed to send to ${recipient}: ${result.error}`);
+  const email = await loadDigestEmail(digestId);
+  if (!email) {
+    results.errors.push("Digest not found");
+    return results;
+  }
+  const { subject, html, text } = email;
+
+  const logs: (typeof schema.emailLogs.$inferInsert)[] = [];
+
+  const chunks: string[][] = [];
+  for (let i = 0; i < recipients.length; i += BATCH_SIZE) {
+    chunks.push(recipients.slice(i, i + BATCH_SIZE));
+  }
+
+  const chunkResults = await mapWithConcurrency(
+    chunks,
+    BATCH_CONCURRENCY,
+    async (chunk) => {
+      const sent = await sendBatchWithRetry(chunk, subject, html, text);
+
+      // If the batch endpoint itself is failing, retry the chunk as
+      // individual sends, a bounded number at a time. Not when it failed on
+      // the rate limit: single sends would only multiply the requests.
+      if (sent.every((result) => !result.success && !result.rateLimited)) {
+        return mapWithConcurrency(chunk, SEND_CONCURRENCY, (recipient) =>
+          sendEmailWithRetry(recipient, subject, html, text)
+        );
+      }
+      return sent;
+    }
+  );
+  const attemptedAt = new Date();
+
+  for (let c = 0; c < chunks.length; c++) {
+    const chunk = chunks[c];
+
+    for (let j = 0; j < chunk.length; j++) {
+      const recipient = chunk[j];
+      const result = chunkResults[c][j];
+
+      logs.push({
+        digestId,
+        recipient,
+        status: result.success ? "sent" : "failed",
+        providerMessageId: result.messageId || null,
+        attempts: 1,
+        lastAttemptAt: attemptedAt,
+        errorMessage: result.error || null,
+      });
+
+      if (result.success) {
+        results.sent++;
+      } else {
+        results.failed++;
+        results.errors.push(`Failed to send to ${recipient}: ${result.error}`);
+      }
     }
   }
 
+  // One multi-row insert for the whole send instead of one per recipient
+  await db.insert(schema.emailLogs).values(logs);
+
   return results;
 }
@@ -1,18 +1,14 @@
-import Anthropic from "@anthropic-ai/sdk";
+import crypto from "crypto";
 import { db, schema } from "@/lib/db";
-import { eq, and, gte, lte, inArray } from "drizzle-orm";
+import { eq, and, gte, lte, inArray, count, sql, type SQL } from "drizzle-orm";
 import { config } from "@/lib/config";
-
-let anthropicClient: Anthropic | null = null;
-
-function getAnthropic(): Anthropic {
-  if (!anthropicClient) {
-    anthropicClient = new Anthropic({
-      apiKey: config.anthropicApiKey(),
-    });
-  }
-  return anthropicClient;
-}
+import {
+  acquireAnthropicCapacity,
+  estimateTokens,
+  getAnthropic,
+} from "../anthropic";
+import { mapWithConcurrency } from "../concurrency";
+import { getWeekNumber, getWeekDateRange } from "@/lib/week";
 
 export interface DigestTheme {
   name: string;
@@ -45,31 +41,11 @@ export interface DigestContent {
   generatedAt: string;
 }
 
-function getWeekNumber(date: Date): string {
-  const d = new Date(date);
-  d.setHours(0, 0, 0, 0);
-  d.setDate(d.getDate() + 4 - (d.getDay() || 7));
-  const yearStart = new Date(d.getFullYear(), 0, 1);
-  const weekNo = Math.ceil(
-    ((d.getTime() - yearStart.getTime()) / 86400000 + 1) / 7
-  );
-  return `${d.getFullYear()}-W${weekNo.toString().padStart(2, "0")}`;
-}
-
-function getWeekDateRange(weekNumber: string): { start: Date; end: Date } {
-  const [year, week] = weekNumber.split("-W").map(Number);
-  const jan1 = new Date(year, 0, 1);
-  const days = (week - 1) * 7 - jan1.getDay() + 1;
-  const start = new Date(year, 0, days + 1);
-  const end = new Date(start);
-  end.setDate(end.getDate() + 6);
-  return { start, end };
-}
-
 function formatDateRange(start: Date, end: Date): string {
   const options: Intl.DateTimeFormatOptions = {
     month: "short",
     day: "numeric",
+    timeZone: "UTC",
   };
   const startStr = start.toLocaleDateString("en-US", options);
   const endStr = end.toLocaleDateString("en-US", {
@@ -99,6 +75,14 @@ const SYNTHESIZE_TOOL = {
   },
 };
 
+// Built once so every synthesis request (direct or batched) shares the same
+// tools array instead of allocating a fresh one per cluster.
+const SYNTHESIZE_TOOLS = [SYNTHESIZE_TOOL];
+const SYNTHESIZE_TOOL_CHOICE = {
+  type: "tool" as const,
+  name: SYNTHESIZE_TOOL.name,
+};
+
 const DIGEST_TOOL = {
   name: "create_digest",
   description: "Create executive summary and signals for the digest",
@@ -122,15 +106,21 @@ const DIGEST_TOOL = {
   },
 };
 
-async function synthesizeCluster(
-  items: {
-    summary: string;
-    keyInformation: string[];
-    themes: string[];
-  }[]
-): Promise<{ themeName: string; synthesizedSummary: string }> {
-  const anthropic = getAnthropic();
+const DIGEST_TOOLS = [DIGEST_TOOL];
+const DIGEST_TOOL_CHOICE = {
+  type: "tool" as const,
+  name: DIGEST_TOOL.name,
+};
 
+type ClusterSynthesisItem = {
+  summary: string;
+  keyInformation: string[];
+  themes: string[];
+};
+
+type ClusterSynthesis = { themeName: string; synthesizedSummary: string };
+
+function synthesisParams(items: ClusterSynthesisItem[]) {
   const itemSummaries = items
     .map(
       (item, i) =>
@@ -138,39 +128,257 @@ async function synthesizeCluster(
     )
     .join("\n\n");
 
-  const response = await anthropic.messages.create({
+  return {
     model: config.claudeModel,
     max_tokens: 1024,
-    tools: [SYNTHESIZE_TOOL],
-    tool_choice: { type: "tool", name: "synthesize_cluster" },
+    tools: SYNTHESIZE_TOOLS,
+    tool_choice: SYNTHESIZE_TOOL_CHOICE,
     messages: [
       {
-        role: "user",
+        role: "user" as const,
         content: `Synthesize these related stories into a single theme:\n\n${itemSummaries}`,
       },
     ],
+  };
+}
+
+// Returns null when the response has no usable synthesis: no tool call, a
+// tool call cut off by max_tokens, or an empty name or summary
+function parseSynthesis(message: {
+  content: readonly { type: string; input?: unknown }[];
+  stop_reason: string | null;
+}): ClusterSynthesis | null {
+  if (message.stop_reason === "max_tokens") {
+    return null;
+  }
+
+  const toolUse = message.content.find((block) => block.type === "tool_use");
+  if (!toolUse) {
+    return null;
+  }
+
+  const input = toolUse.input as {
+    theme_name?: string;
+    synthesized_summary?: string;
+  };
+  const themeName = input.theme_name?.trim();
+  const synthesizedSummary = input.synthesized_summary?.trim();
+  if (!themeName || !synthesizedSummary) {
+    return null;
+  }
+
+  return { themeName, synthesizedSummary };
+}
+
+async function synthesizeCluster(
+  items: ClusterSynthesisItem[]
+): Promise<ClusterSynthesis | null> {
+  const anthropic = await getAnthropic();
+  const params = synthesisParams(items);
+  await acquireAnthropicCapacity(estimateTokens(params.messages[0].content));
+  const response = await anthropic.messages.create(params);
+  return parseSynthesis(response);
+}
+
+// Direct synthesis requests in flight at once
+const SYNTHESIS_CONCURRENCY = 4;
+
+// How long to wait for a synthesis batch before cancelling it, and then for
+// the cancellation to settle. Together they stay well inside the digest
+// routes' maxDuration (300s), leaving time to synthesize the leftovers
+// directly and to save and send the digest.
+const BATCH_POLL_INTERVAL_MS = 10_000;
+const BATCH_TIMEOUT_MS = 3 * 60_000;
+const BATCH_CANCEL_GRACE_MS = 30_000;
+
+// Submit every cluster as one Message Batch, which is billed at half price
+// and processed in parallel on Anthropic's side. Clusters whose request
+// fails, or that haven't finished before the timeout, are left out of the
+// result for the caller to synthesize directly, as are ones that came back
+// without a usable synthesis.
+async function synthesizeClustersBatch(
+  clusters: Map<number, ClusterSynthesisItem[]>
+): Promise<Map<number, ClusterSynthesis>> {
+  const anthropic = await getAnthropic();
+  const results = new Map<number, ClusterSynthesis>();
+
+  const batch = await anthropic.beta.messages.batches.create({
+    requests: Array.from(clusters, ([clusterId, items]) => ({
+      custom_id: `cluster-${clusterId}`,
+      params: synthesisParams(items),
+    })),
   });
 
-  const toolUse = response.content.find((block) => block.type === "tool_use");
-  if (toolUse && toolUse.type === "tool_use") {
-    const input = toolUse.input as {
-      theme_name?: string;
-      synthesized_summary?: string;
-    };
-    return {
-      themeName: input.theme_name || "Untitled Theme",
-      synthesizedSummary: input.synthesized_summary || "",
-    };
+  const cancelAt = Date.now() + BATCH_TIMEOUT_MS;
+  const giveUpAt = cancelAt + BATCH_CANCEL_GRACE_MS;
+  let canceled = false;
+  let status = batch.processing_status;
+  while (status !== "ended") {
+    // Cancelling only drops the requests still pending; the ones that
+    // already succeeded are in the results once the batch has ended
+    if (!canceled && Date.now() >= cancelAt) {
+      await anthropic.beta.messages.batches.cancel(batch.id).catch(() => {});
+      canceled = true;
+    }
+    if (Date.now() >= giveUpAt) {
+      return results;
+    }
+    await new Promise((resolve) => setTimeout(resolve, BATCH_POLL_INTERVAL_MS));
+    status = (await anthropic.beta.messages.batches.retrieve(batch.id))
+      .processing_status;
+  }
+
+  for await (const entry of await anthropic.beta.messages.batches.results(
+    batch.id
+  )) {
+    if (entry.result.type === "succeeded") {
+      const synthesis = parseSynthesis(entry.result.message);
+      if (synthesis) {
+        const clusterId = Number(entry.custom_id.slice("cluster-".length));
+        results.set(clusterId, synthesis);
+      }
+    }
+  }
+
+  return results;
+}
+
+async function synthesizeUncached(
+  clusters: Map<number, ClusterSynthesisItem[]>
+): Promise<Map<number, ClusterSynthesis | null>> {
+  // Batches take minutes to complete, so small digests call directly
+  const results: Map<number, ClusterSynthesis | null> =
+    clusters.size >= config.synthesisBatchMinClusters
+      ? await synthesizeClustersBatch(clusters).catch(
+          () => new Map<number, ClusterSynthesis>()
+        )
+      : new Map<number, ClusterSynthesis>();
+
+  const remaining = Array.from(clusters).filter(([id]) => !results.has(id));
+  const syntheses = await mapWithConcurrency(
+    remaining,
+    SYNTHESIS_CONCURRENCY,
+    ([, items]) => synthesizeCluster(items)
+  );
+  remaining.forEach(([clusterId], i) => results.set(clusterId, syntheses[i]));
+
+  return results;
+}
+
+// Bump whenever the synthesis prompt or tool schema changes, so syntheses
+// made with the old prompt stop matching
+const SYNTHESIS_PROMPT_VERSION = 1;
+// Cached syntheses older than this are made again
+const SYNTHESIS_CACHE_TTL_DAYS = 30;
+
+// Clusters with the same members (for instance after reprocessing a week)
+// produce the same prompt, so the key covers the prompt version, the model
+// and the member details in a stable order
+function synthesisCacheKey(items: ClusterSynthesisItem[]): string {
+  const hash = crypto
+    .createHash("sha256")
+    .update(`v${SYNTHESIS_PROMPT_VERSION}\n`)
+    .update(config.claudeModel);
+  const members = items
+    .map((item) => JSON.stringify([item.summary, item.keyInformation, item.themes]))
+    .sort();
+  for (const member of members) {
+    hash.update("\n").update(member);
+  }
+  return hash.digest("hex");
+}
+
+// Clusters map to null when no usable synthesis could be made; those are
+// neither cached nor saved, so the next digest tries them again
+async function synthesizeClusters(
+  clusters: Map<number, ClusterSynthesisItem[]>
+): Promise<Map<number, ClusterSynthesis | null>> {
+  const results = new Map<number, ClusterSynthesis | null>();
+  if (clusters.size === 0) {
+    return results;
+  }
+
+  const keys = new Map<number, string>();
+  for (const [clusterId, items] of clusters) {
+    keys.set(clusterId, synthesisCacheKey(items));
+  }
+
+  const cutoff = new Date();
+  cutoff.setDate(cutoff.getDate() - SYNTHESIS_CACHE_TTL_DAYS);
+
+  const cached = await db
+    .select()
+    .from(schema.synthesisCache)
+    .where(
+      and(
+        inArray(schema.synthesisCache.key, Array.from(new Set(keys.values()))),
+        gte(schema.synthesisCache.createdAt, cutoff)
+      )
+    );
+  const cachedByKey = new Map(cached.map((row) => [row.key, row]));
+
+  const uncached = new Map<number, ClusterSynthesisItem[]>();
+  for (const [clusterId, items] of clusters) {
+    const hit = cachedByKey.get(keys.get(clusterId)!);
+    if (hit) {
+      results.set(clusterId, {
+        themeName: hit.themeName,
+        synthesizedSummary: hit.synthesizedSummary,
+      });
+    } else {
+      uncached.set(clusterId, items);
+    }
   }
 
-  return { themeName: "Untitled Theme", synthesizedSummary: "" };
+  if (uncached.size > 0) {
+    const fresh = await synthesizeUncached(uncached);
+    const rows = new Map<string, typeof schema.synthesisCache.$inferInsert>();
+    for (const [clusterId, synthesis] of fresh) {
+      results.set(clusterId, synthesis);
+      if (synthesis) {
+        const key = keys.get(clusterId)!;
+        rows.set(key, { key, ...synthesis });
+      }
+    }
+
+    // Expired rows are still there, so they're refreshed in place
+    if (rows.size > 0) {
+      await db
+        .insert(schema.synthesisCache)
+        .values(Array.from(rows.values()))
+        .onConflictDoUpdate({
+          target: schema.synthesisCache.key,
+          set: {
+            themeName: sql`excluded.theme_name`,
+            synthesizedSummary: sql`excluded.synthesized_summary`,
+            createdAt: sql`now()`,
+          },
+        });
+    }
+  }
+
+  return results;
+}
+
+async function saveClusterSyntheses(
+  updates: { id: number; name: string; synthesizedSummary: string }[]
+): Promise<void> {
+  if (updates.length === 0) return;
+
+  const [first, ...rest] = updates.map(({ id, name, synthesizedSummary }) =>
+    db
+      .update(schema.storyClusters)
+      .set({ name, synthesizedSummary })
+      .where(eq(schema.storyClusters.id, id))
+  );
+  await db.batch([first, ...rest]);
 }
 
 async function generateExecutiveSummary(
   themes: DigestTheme[],
   hotTakes: DigestHotTake[]
 ): Promise<{ executiveSummary: string[]; signalsToWatch: string[] }> {
-  const anthropic = getAnthropic();
+  const anthropic = await getAnthropic();
 
   const themeSummaries = themes
     .map(
@@ -184,15 +392,18 @@ async function generateExecutiveSummary(
     .map((ht) => `- ${ht.take} (${ht.source})`)
     .join("\n");
 
+  const prompt = `Create an executive summary and signals to watch based on this week's themes and hot takes:\n\nThemes:\n${themeSummaries}\n\nNotable Takes:\n${hotTakeSummaries}`;
+  await acquireAnthropicCapacity(estimateTokens(prompt));
+
   const response = await anthropic.messages.create({
     model: config.claudeModel,
     max_tokens: 1024,
-    tools: [DIGEST_TOOL],
-    tool_choice: { type: "tool", name: "create_digest" },
+    tools: DIGEST_TOOLS,
+    tool_choice: DIGEST_TOOL_CHOICE,
     messages: [
       {
         role: "user",
-        content: `Create an executive summary and signals to watch based on this week's themes and hot takes:\n\nThemes:\n${themeSummaries}\n\nNotable Takes:\n${hotTakeSummaries}`,
+        content: prompt,
       },
     ],
   });
@@ -212,18 +423,24 @@ async function generateExecutiveSummary(
   return { executiveSummary: [], signalsToWatch: [] };
 }
 
-export async function generateDigest(
-  weekNumber?: string
-): Promise<DigestContent> {
-  const currentWeek = weekNumber || getWeekNumber(new Date());
-  const { start, end } = getWeekDateRange(currentWeek);
-
-  // Get processed items for the week
-  const processedItemsData = await db
+// Columns the digest reads for each item; embeddings and content bodies are
+// left out
+function selectDigestItems(where: SQL | undefined) {
+  return db
     .select({
-      processed: schema.processedItems,
-      content: schema.contentItems,
-      source: schema.sources,
+      processed: {
+        id: schema.processedItems.id,
+        summary: schema.processedItems.summary,
+        keyInformation: schema.processedItems.keyInformation,
+        themes: schema.processedItems.themes,
+        hotTakes: schema.processedItems.hotTakes,
+      },
+      content: {
+        title: schema.contentItems.title,
+        author: schema.contentItems.author,
+        url: schema.contentItems.url,
+      },
+      source: { name: schema.sources.name },
     })
     .from(schema.processedItems)
     .innerJoin(
@@ -231,91 +448,157 @@ export async function generateDigest(
       eq(schema.processedItems.contentItemId, schema.contentItems.id)
     )
     .innerJoin(schema.sources, eq(schema.contentItems.sourceId, schema.sources.id))
-    .where(
-      and(
-        gte(schema.contentItems.ingestedAt, start),
-        lte(schema.contentItems.ingestedAt, end)
-      )
-    );
+    .where(where);
+}
 
-  // Build source index
-  const sourceMap = new Map<number, { name: string; type: string; count: number }>();
-  for (const item of processedItemsData) {
-    const existing = sourceMap.get(item.source.id);
-    if (existing) {
-      existing.count++;
-    } else {
-      sourceMap.set(item.source.id, {
-        name: item.source.name,
-        type: item.source.sourceType,
-        count: 1,
-      });
-    }
-  }
-  const sourceIndex = Array.from(sourceMap.values()).map((s) => ({
-    name: s.name,
-    type: s.type,
-    itemCount: s.count,
-  }));
-
-  // Get story clusters for the week
-  const clusters = await db
-    .select()
-    .from(schema.storyClusters)
-    .where(eq(schema.storyClusters.weekNumber, currentWeek));
+type DigestItem = Awaited<ReturnType<typeof selectDigestItems>>[number];
 
-  const themes: DigestTheme[] = [];
-  const clusteredItemIds = new Set<number>();
+export async function generateDigest(
+  weekNumber?: string
+): Promise<DigestContent> {
+  const currentWeek = weekNumber || getWeekNumber(new Date());
+  const { start, end } = getWeekDateRange(currentWeek);
 
-  // Process each cluster
-  for (const cluster of clusters) {
-    // Get cluster members
-    const members = await db
+  const inWeek = and(
+    gte(schema.contentItems.ingestedAt, start),
+    lte(schema.contentItems.ingestedAt, end)
+  );
+
+  // These reads are independent, so they run concurrently
+  const [processedItemsData, sourceIndex, clusters] = await Promise.all([
+    // Get processed items for the week
+    selectDigestItems(inWeek),
+
+    // Build source index, counted by the database
+    db
       .select({
-        member: schema.clusterMembers,
-        processed: schema.processedItems,
-        content: schema.contentItems,
-        source: schema.sources,
+        name: schema.sources.name,
+        type: schema.sources.sourceType,
+        itemCount: count(schema.processedItems.id),
       })
-      .from(schema.clusterMembers)
-      .innerJoin(
-        schema.processedItems,
-        eq(schema.clusterMembers.processedItemId, schema.processedItems.id)
-      )
+      .from(schema.processedItems)
       .innerJoin(
         schema.contentItems,
         eq(schema.processedItems.contentItemId, schema.contentItems.id)
       )
       .innerJoin(schema.sources, eq(schema.contentItems.sourceId, schema.sources.id))
-      .where(eq(schema.clusterMembers.clusterId, cluster.id));
+      .where(inWeek)
+      .groupBy(schema.sources.id)
+      .orderBy(schema.sources.name),
 
-    if (members.length === 0) continue;
+    // Get story clusters for the week
+    db
+      .select()
+      .from(schema.storyClusters)
+      .where(eq(schema.storyClusters.weekNumber, currentWeek)),
+  ]);
 
-    // Mark items as clustered
-    for (const m of members) {
-      clusteredItemIds.add(m.processed.id);
+  const themes: DigestTheme[] = [];
+  const clusteredItemIds = new Set<number>();
+
+  // Cluster members are almost always items from this week, which are
+  // already loaded; only membership is read here, plus any stragglers
+  const itemsById = new Map<number, DigestItem>(
+    processedItemsData.map((item) => [item.processed.id, item])
+  );
+
+  const memberRows =
+    clusters.length > 0
+      ? await db
+          .select({
+            clusterId: schema.clusterMembers.clusterId,
+            processedItemId: schema.clusterMembers.processedItemId,
+          })
+          .from(schema.clusterMembers)
+          .where(
+            inArray(
+              schema.clusterMembers.clusterId,
+              clusters.map((c) => c.id)
+            )
+          )
+      : [];
+
+  const missingIds = memberRows
+    .map((row) => row.processedItemId)
+    .filter((id) => !itemsById.has(id));
+  if (missingIds.length > 0) {
+    const missing = await selectDigestItems(
+      inArray(schema.processedItems.id, missingIds)
+    );
+    for (const item of missing) {
+      itemsById.set(item.processed.id, item);
+    }
+  }
+
+  const membersByCluster = new Map<number, DigestItem[]>();
+  for (const row of memberRows) {
+    const item = itemsById.get(row.processedItemId);
+    if (!item) continue;
+    const members = membersByCluster.get(row.clusterId);
+    if (members) {
+      members.push(item);
+    } else {
+      membersByCluster.set(row.clusterId, [item]);
     }
+  }
 
-    // Synthesize cluster if not already done
-    let themeName = cluster.name;
-    let synthesizedSummary = cluster.synthesizedSummary;
+  // Synthesize every cluster that doesn't have a name and summary yet in
+  // one go
+  const clustersWithMembers: {
+    cluster: (typeof clusters)[number];
+    members: DigestItem[];
+  }[] = [];
+  const pendingSynthesis = new Map<number, ClusterSynthesisItem[]>();
 
-    if (!themeName || !synthesizedSummary) {
-      const synthesis = await synthesizeCluster(
+  for (const cluster of clusters) {
+    const members = membersByCluster.get(cluster.id) ?? [];
+    if (members.length === 0) continue;
+
+    clustersWithMembers.push({ cluster, members });
+
+    if (!cluster.name || !cluster.synthesizedSummary) {
+      pendingSynthesis.set(
+        cluster.id,
         members.map((m) => ({
           summary: m.processed.summary || "",
           keyInformation: (m.processed.keyInformation as string[]) || [],
           themes: (m.processed.themes as string[]) || [],
         }))
       );
+    }
+  }
+
+  const syntheses = await synthesizeClusters(pendingSynthesis);
+
+  // Newly synthesized names and summaries, written back while the executive
+  // summary is being generated
+  const clusterUpdates: { id: number; name: string; synthesizedSummary: string }[] =
+    [];
+
+  // Process each cluster
+  for (const { cluster, members } of clustersWithMembers) {
+    // Mark items as clustered
+    for (const m of members) {
+      clusteredItemIds.add(m.processed.id);
+    }
+
+    // Use the stored synthesis, or the one just generated
+    let themeName = cluster.name;
+    let synthesizedSummary = cluster.synthesizedSummary;
+
+    const synthesis = syntheses.get(cluster.id);
+    if (synthesis === null) {
+      themeName ||= "Untitled Theme";
+      synthesizedSummary ||= "";
+    } else if (synthesis) {
       themeName = synthesis.themeName;
       synthesizedSummary = synthesis.synthesizedSummary;
 
-      // Update cluster
-      await db
-        .update(schema.storyClusters)
-        .set({ name: themeName, synthesizedSummary })
-        .where(eq(schema.storyClusters.id, cluster.id));
+      clusterUpdates.push({
+        id: cluster.id,
+        name: themeName,
+        synthesizedSummary,
+      });
     }
 
     // Determine novelty status
@@ -340,51 +623,52 @@ export async function generateDigest(
     });
   }
 
-  // Add unclustered items as individual themes
-  const unclusteredItems = processedItemsData.filter(
-    (item) => !clusteredItemIds.has(item.processed.id)
-  );
-
-  for (const item of unclusteredItems) {
-    const hasFollowup = ((item.processed.keyInformation as string[]) || []).some(
-      (ki) => ki.includes("[Follow-up story]")
-    );
-
-    themes.push({
-      name: item.content.title || "Untitled",
-      summary: item.processed.summary || "",
-      noveltyStatus: hasFollowup ? "follow-up" : "ongoing",
-      items: [
-        {
-          title: item.content.title || "Untitled",
-          author: item.content.author || undefined,
-          source: item.source.name,
-          url: item.content.url || undefined,
-          keyPoints: (item.processed.keyInformation as string[]) || [],
-        },
-      ],
-    });
-  }
-
-  // Collect hot takes
+  // One pass over the week's items: every item contributes its hot takes,
+  // and unclustered items are added as individual themes
   const hotTakes: DigestHotTake[] = [];
   for (const item of processedItemsData) {
+    const keyInformation = (item.processed.keyInformation as string[]) || [];
+    const author = item.content.author || undefined;
+
+    if (!clusteredItemIds.has(item.processed.id)) {
+      const hasFollowup = keyInformation.some((ki) =>
+        ki.includes("[Follow-up story]")
+      );
+      const title = item.content.title || "Untitled";
+
+      themes.push({
+        name: title,
+        summary: item.processed.summary || "",
+        noveltyStatus: hasFollowup ? "follow-up" : "ongoing",
+        items: [
+          {
+            title,
+            author,
+            source: item.source.name,
+            url: item.content.url || undefined,
+            keyPoints: keyInformation,
+          },
+        ],
+      });
+    }
+
     const takes = (item.processed.hotTakes as { take: string; context: string }[]) || [];
     for (const take of takes) {
       hotTakes.push({
         take: take.take,
         context: take.context,
         source: item.source.name,
-        author: item.content.author || undefined,
+        author,
       });
     }
   }
 
-  // Generate executive summary
-  const { executiveSummary, signalsToWatch } = await generateExecutiveSummary(
-    themes,
-    hotTakes
-  );
+  // The executive summary only needs the themes, so it doesn't wait for
+  // the cluster updates
+  const [{ executiveSummary, signalsToWatch }] = await Promise.all([
+    generateExecutiveSummary(themes, hotTakes),
+    saveClusterSyntheses(clusterUpdates),
+  ]);
 
   return {
     weekNumber: currentWeek,
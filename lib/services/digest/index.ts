@@ -1,67 +1,78 @@
+import crypto from "crypto";
 import { db, schema } from "@/lib/db";
-import { eq } from "drizzle-orm";
+import { eq, sql } from "drizzle-orm";
 import { generateDigest, type DigestContent } from "./generator";
 import { renderMarkdown, renderHtml, renderPlainText } from "./renderer";
 
 export { generateDigest, type DigestContent };
 export { renderMarkdown, renderHtml, renderPlainText };
 
+// Hash of everything in the digest except when it was generated, so a
+// regeneration with identical content can be detected
+function digestContentHash(content: DigestContent): string {
+  return crypto
+    .createHash("sha256")
+    .update(JSON.stringify({ ...content, generatedAt: undefined }))
+    .digest("hex");
+}
+
 export async function saveDigest(
   content: DigestContent
 ): Promise<{ id: number }> {
-  const markdown = renderMarkdown(content);
-  const html = renderHtml(content);
+  const contentHash = digestContentHash(content);
+  const digest = {
+    dateRange: content.dateRange,
+    sourcesCount: content.sourceIndex.length,
+    itemsCount: content.themes.reduce((sum, t) => sum + t.items.length, 0),
+    markdownContent: renderMarkdown(content),
+    htmlContent: renderHtml(content),
+    digestData: content,
+    contentHash,
+  };
 
-  // Check if digest for this week exists
-  const existing = await db
-    .select()
+  // Insert, or update the week's existing digest in the same statement. A
+  // regeneration with identical content leaves the row untouched.
+  const [saved] = await db
+    .insert(schema.weeklyDigests)
+    .values({ weekNumber: content.weekNumber, ...digest })
+    .onConflictDoUpdate({
+      target: schema.weeklyDigests.weekNumber,
+      set: { ...digest, generatedAt: sql`now()` },
+      setWhere: sql`${schema.weeklyDigests.contentHash} IS DISTINCT FROM excluded.content_hash`,
+    })
+    .returning({ id: schema.weeklyDigests.id });
+
+  if (saved) {
+    return { id: saved.id };
+  }
+
+  // Unchanged digests aren't written, so no row comes back
+  const [existing] = await db
+    .select({ id: schema.weeklyDigests.id })
     .from(schema.weeklyDigests)
     .where(eq(schema.weeklyDigests.weekNumber, content.weekNumber))
     .limit(1);
 
-  if (existing.length > 0) {
-    // Update existing
-    await db
-      .update(schema.weeklyDigests)
-      .set({
-        dateRange: content.dateRange,
-        sourcesCount: content.sourceIndex.length,
-        itemsCount: content.themes.reduce((sum, t) => sum + t.items.length, 0),
-        markdownContent: markdown,
-        htmlContent: html,
-        digestData: content,
-        generatedAt: new Date(),
-      })
-      .where(eq(schema.weeklyDigests.id, existing[0].id));
-
-    return { id: existing[0].id };
-  }
-
-  // Insert new
-  const [inserted] = await db
-    .insert(schema.weeklyDigests)
-    .values({
-      weekNumber: content.weekNumber,
-      dateRange: content.dateRange,
-      sourcesCount: content.sourceIndex.length,
-      itemsCount: content.themes.reduce((sum, t) => sum + t.items.length, 0),
-      markdownContent: markdown,
-      htmlContent: html,
-      digestData: content,
-    })
-    .returning();
+  return { id: existing.id };
+}
 
-  return { id: inserted.id };
+function prepareDigestByWeek() {
+  return db
+    .select()
+    .from(schema.weeklyDigests)
+    .where(eq(schema.weeklyDigests.weekNumber, sql.placeholder("weekNumber")))
+    .limit(1)
+    .prepare("digest_by_week");
 }
 
+// Built on first use and reused, so repeated lookups skip rebuilding the SQL
+let digestByWeek: ReturnType<typeof prepareDigestByWeek> | null = null;
+
 export async function getDigest(
   weekNumber: string
 ): Promise<{ digest: typeof schema.weeklyDigests.$inferSelect | null }> {
-  const result = await db
-    .select()
-    .from(schema.weeklyDigests)
-    .where(eq(schema.weeklyDigests.weekNumber, weekNumber))
-    .limit(1);
+  digestByWeek ??= prepareDigestByWeek();
+  const result = await digestByWeek.execute({ weekNumber });
 
   return { digest: result[0] || null };
 }
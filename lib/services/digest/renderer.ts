@@ -1,4 +1,30 @@
-import type { DigestContent } from "./generator";
+import type { DigestContent, DigestTheme } from "./generator";
+
+// How each novelty status is shown in the different output formats
+const NOVELTY_STATUS: Record<
+  DigestTheme["noveltyStatus"],
+  { badge: string; label: string; tag: string; color: string }
+> = {
+  new: { badge: "🆕", label: "New", tag: "[NEW]", color: "#22c55e" },
+  "follow-up": {
+    badge: "🔄",
+    label: "Follow-up",
+    tag: "[FOLLOW-UP]",
+    color: "#eab308",
+  },
+  ongoing: { badge: "📌", label: "Ongoing", tag: "[ONGOING]", color: "#6b7280" },
+};
+
+// A digest is usually rendered in several formats back to back, so the last
+// formatted timestamp is kept rather than formatted again for each one
+let lastGeneratedAt: { iso: string; formatted: string } | null = null;
+
+function formatGeneratedAt(iso: string): string {
+  if (lastGeneratedAt?.iso !== iso) {
+    lastGeneratedAt = { iso, formatted: new Date(iso).toLocaleString() };
+  }
+  return lastGeneratedAt.formatted;
+}
 
 export function renderMarkdown(digest: DigestContent): string {
   const lines: string[] = [];
@@ -8,7 +34,7 @@ export function renderMarkdown(digest: DigestContent): string {
   lines.push(`## Week ${digest.weekNumber} | ${digest.dateRange}`);
   lines.push(``);
   lines.push(
-    `*${digest.sourceIndex.length} sources | ${digest.themes.length} themes | Generated ${new Date(digest.generatedAt).toLocaleString()}*`
+    `*${digest.sourceIndex.length} sources | ${digest.themes.length} themes | Generated ${formatGeneratedAt(digest.generatedAt)}*`
   );
   lines.push(``);
 
@@ -25,12 +51,7 @@ export function renderMarkdown(digest: DigestContent): string {
   lines.push(``);
 
   digest.themes.forEach((theme, idx) => {
-    const statusBadge =
-      theme.noveltyStatus === "new"
-        ? "🆕"
-        : theme.noveltyStatus === "follow-up"
-          ? "🔄"
-          : "📌";
+    const statusBadge = NOVELTY_STATUS[theme.noveltyStatus].badge;
     lines.push(`### ${idx + 1}. ${theme.name} ${statusBadge}`);
     lines.push(``);
     lines.push(theme.summary);
@@ -84,31 +105,15 @@ export function renderMarkdown(digest: DigestContent): string {
 
   // Footer
   lines.push(`---`);
-  lines.push(`*Generated by Weekly Intel on ${new Date().toLocaleString()}*`);
+  lines.push(
+    `*Generated by Weekly Intel on ${formatGeneratedAt(digest.generatedAt)}*`
+  );
 
   return lines.join("\n");
 }
 
-export function renderHtml(digest: DigestContent): string {
-  const statusColors = {
-    new: "#22c55e",
-    "follow-up": "#eab308",
-    ongoing: "#6b7280",
-  };
-
-  const statusLabels = {
-    new: "New",
-    "follow-up": "Follow-up",
-    ongoing: "Ongoing",
-  };
-
-  return `<!DOCTYPE html>
-<html>
-<head>
-  <meta charset="utf-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>Weekly Intel - ${digest.weekNumber}</title>
-  <style>
+// The stylesheet is the same for every digest, so it is built once
+const HTML_STYLE = `  <style>
     body {
       font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
       line-height: 1.6;
@@ -197,7 +202,23 @@ export function renderHtml(digest: DigestContent): string {
     a { color: #2563eb; text-decoration: none; }
     a:hover { text-decoration: underline; }
   </style>
-</head>
+`;
+
+export function renderHtml(digest: DigestContent): string {
+  // Built as a list of parts joined once at the end, like the markdown and
+  // plain-text renderers, rather than one nested template expression
+  const parts: string[] = [];
+
+  parts.push(
+    `<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Weekly Intel - ${digest.weekNumber}</title>
+`,
+    HTML_STYLE,
+    `</head>
 <body>
   <div class="header">
     <h1>Weekly Intel Digest</h1>
@@ -208,77 +229,107 @@ export function renderHtml(digest: DigestContent): string {
   <div class="card executive-summary">
     <h2>Executive Summary</h2>
     <ul>
-      ${digest.executiveSummary.map((point) => `<li>${escapeHtml(point)}</li>`).join("")}
+      `
+  );
+  for (const point of digest.executiveSummary) {
+    parts.push(`<li>${escapeHtml(point)}</li>`);
+  }
+  parts.push(`
     </ul>
   </div>
 
   <h2>Key Themes</h2>
-  ${digest.themes
-    .map(
-      (theme, idx) => `
+  `);
+
+  digest.themes.forEach((theme, idx) => {
+    const status = NOVELTY_STATUS[theme.noveltyStatus];
+    parts.push(`
     <div class="card">
       <div class="theme-header">
         <h3>${idx + 1}. ${escapeHtml(theme.name)}</h3>
-        <span class="badge" style="background: ${statusColors[theme.noveltyStatus]}">${statusLabels[theme.noveltyStatus]}</span>
+        <span class="badge" style="background: ${status.color}">${status.label}</span>
       </div>
       <p>${escapeHtml(theme.summary)}</p>
-      ${
-        theme.items.length > 1
-          ? `<ul>${theme.items.map((item) => `<li>${item.url ? `<a href="${escapeHtml(item.url)}">${escapeHtml(item.title)}</a>` : escapeHtml(item.title)} (${escapeHtml(item.source)})</li>`).join("")}</ul>`
-          : ""
+      `);
+    if (theme.items.length > 1) {
+      parts.push(`<ul>`);
+      for (const item of theme.items) {
+        const title = escapeHtml(item.title);
+        parts.push(
+          `<li>${item.url ? `<a href="${escapeHtml(item.url)}">${title}</a>` : title} (${escapeHtml(item.source)})</li>`
+        );
       }
+      parts.push(`</ul>`);
+    }
+    parts.push(`
     </div>
-  `
-    )
-    .join("")}
+  `);
+  });
+
+  parts.push(`
 
-  ${
-    digest.hotTakes.length > 0
-      ? `
+  `);
+
+  if (digest.hotTakes.length > 0) {
+    parts.push(`
     <h2>Hot Takes</h2>
-    ${digest.hotTakes
-      .slice(0, 10)
-      .map(
-        (take) => `
+    `);
+    for (const take of digest.hotTakes.slice(0, 10)) {
+      parts.push(`
       <div class="hot-take">
         <div class="take">${escapeHtml(take.take)}</div>
         <div class="meta">${take.author ? `${escapeHtml(take.author)} via ` : ""}${escapeHtml(take.source)} — ${escapeHtml(take.context)}</div>
       </div>
-    `
-      )
-      .join("")}
-  `
-      : ""
+    `);
+    }
+    parts.push(`
+  `);
   }
 
-  ${
-    digest.signalsToWatch.length > 0
-      ? `
+  parts.push(`
+
+  `);
+
+  if (digest.signalsToWatch.length > 0) {
+    parts.push(`
     <h2>Signals to Watch</h2>
     <div class="card">
       <ul>
-        ${digest.signalsToWatch.map((signal) => `<li>${escapeHtml(signal)}</li>`).join("")}
+        `);
+    for (const signal of digest.signalsToWatch) {
+      parts.push(`<li>${escapeHtml(signal)}</li>`);
+    }
+    parts.push(`
       </ul>
     </div>
-  `
-      : ""
+  `);
   }
 
+  parts.push(`
+
   <h2>Source Index</h2>
   <table>
     <thead>
       <tr><th>Source</th><th>Type</th><th>Items</th></tr>
     </thead>
     <tbody>
-      ${digest.sourceIndex.map((source) => `<tr><td>${escapeHtml(source.name)}</td><td>${escapeHtml(source.type)}</td><td>${source.itemCount}</td></tr>`).join("")}
+      `);
+  for (const source of digest.sourceIndex) {
+    parts.push(
+      `<tr><td>${escapeHtml(source.name)}</td><td>${escapeHtml(source.type)}</td><td>${source.itemCount}</td></tr>`
+    );
+  }
+  parts.push(`
     </tbody>
   </table>
 
   <div class="footer">
-    Generated by Weekly Intel on ${new Date(digest.generatedAt).toLocaleString()}
+    Generated by Weekly Intel on ${formatGeneratedAt(digest.generatedAt)}
   </div>
 </body>
-</html>`;
+</html>`);
+
+  return parts.join("");
 }
 
 function escapeHtml(text: string): string {
@@ -308,12 +359,7 @@ export function renderPlainText(digest: DigestContent): string {
   lines.push(`KEY THEMES`);
   lines.push(`${"-".repeat(30)}`);
   digest.themes.forEach((theme, idx) => {
-    const status =
-      theme.noveltyStatus === "new"
-        ? "[NEW]"
-        : theme.noveltyStatus === "follow-up"
-          ? "[FOLLOW-UP]"
-          : "[ONGOING]";
+    const status = NOVELTY_STATUS[theme.noveltyStatus].tag;
     lines.push(`${idx + 1}. ${theme.name} ${status}`);
     lines.push(`   ${theme.summary}`);
     lines.push(``);
@@ -340,7 +386,7 @@ export function renderPlainText(digest: DigestContent): string {
 
   lines.push(`${"-".repeat(50)}`);
   lines.push(
-    `Generated by Weekly Intel on ${new Date(digest.generatedAt).toLocaleString()}`
+    `Generated by Weekly Intel on ${formatGeneratedAt(digest.generatedAt)}`
   );
 
   return lines.join("\n");
@@ -1,11 +1,102 @@
 import { db, schema } from "@/lib/db";
-import { eq } from "drizzle-orm";
-import { ingestSubstack, type IngestResult } from "./substack";
-import { ingestYouTube } from "./youtube";
-import { ingestGmail } from "./gmail";
+import { eq, inArray, sql } from "drizzle-orm";
+import { createKeyedLimiter, mapWithConcurrency } from "../concurrency";
+import type { IngestResult } from "./common";
 
 export type { IngestResult };
-export { getGmailAuthUrl, handleGmailCallback } from "./gmail";
+
+// Ingestors are loaded on demand so a run only pays for the SDKs of the
+// source types it actually touches (the Gmail client in particular is heavy).
+type Source = typeof schema.sources.$inferSelect;
+
+const ingestors = {
+  substack: async (source: Source) => {
+    const { ingestSubstack } = await import("./substack");
+    return ingestSubstack(
+      source.id,
+      source.config as { feedUrl: string },
+      false,
+      { etag: source.feedEtag, lastModified: source.feedLastModified }
+    );
+  },
+  youtube: async (source: Source) => {
+    const { ingestYouTube } = await import("./youtube");
+    return ingestYouTube(
+      source.id,
+      source.config as {
+        channelId?: string;
+        channelUrl?: string;
+        playlistId?: string;
+        playlistUrl?: string;
+        videoUrls?: string[];
+        videoIds?: string[];
+        maxVideos?: number;
+      }
+    );
+  },
+  gmail: async (source: Source) => {
+    const { ingestGmail } = await import("./gmail");
+    return ingestGmail(
+      source.id,
+      source.config as {
+        label?: string;
+        senders?: string[];
+        daysBack?: number;
+        maxMessages?: number;
+      }
+    );
+  },
+} satisfies Record<string, (source: Source) => Promise<IngestResult>>;
+
+type SourceType = keyof typeof ingestors;
+
+function isSourceType(sourceType: string): sourceType is SourceType {
+  return Object.prototype.hasOwnProperty.call(ingestors, sourceType);
+}
+
+// Ingestion is network-bound, so sources are fetched in parallel
+const SOURCE_CONCURRENCY = 8;
+
+// Sources served by the same host share a smaller budget, so many feeds on
+// one platform don't all hit it at once
+const HOST_CONCURRENCY = 2;
+
+// The host a source's requests go to. Substack publications on
+// *.substack.com count as one host; Gmail and YouTube sources each share
+// their API.
+function sourceHost(source: Source): string {
+  if (source.sourceType === "substack") {
+    try {
+      const host = new URL((source.config as { feedUrl: string }).feedUrl)
+        .hostname;
+      return host.endsWith(".substack.com") ? "substack.com" : host;
+    } catch {
+      // Invalid URLs fail in the ingestor and are reported there
+    }
+  }
+  return source.sourceType;
+}
+
+// Order sources round-robin across hosts so the workers pick up sources for
+// different hosts instead of queueing behind one host's limit
+function interleaveByHost(sources: Source[]): Source[] {
+  const byHost = new Map<string, Source[]>();
+  for (const source of sources) {
+    const host = sourceHost(source);
+    const group = byHost.get(host);
+    if (group) group.push(source);
+    else byHost.set(host, [source]);
+  }
+
+  const groups = [...byHost.values()];
+  const ordered: Source[] = [];
+  for (let i = 0; ordered.length < sources.length; i++) {
+    for (const group of groups) {
+      if (i < group.length) ordered.push(group[i]);
+    }
+  }
+  return ordered;
+}
 
 export async function ingestAllSources(): Promise<{
   results: IngestResult[];
@@ -20,56 +111,51 @@ export async function ingestAllSources(): Promise<{
     .from(schema.sources)
     .where(eq(schema.sources.active, true));
 
-  for (const source of sources) {
-    try {
-      let result: IngestResult;
-
-      switch (source.sourceType) {
-        case "substack":
-          result = await ingestSubstack(
-            source.id,
-            source.config as { feedUrl: string }
-          );
-          break;
-        case "youtube":
-          result = await ingestYouTube(
-            source.id,
-            source.config as {
-              channelId?: string;
-              channelUrl?: string;
-              playlistId?: string;
-              playlistUrl?: string;
-              videoUrls?: string[];
-              videoIds?: string[];
-              maxVideos?: number;
-            }
-          );
-          break;
-        case "gmail":
-          result = await ingestGmail(
-            source.id,
-            source.config as {
-              label?: string;
-              senders?: string[];
-              daysBack?: number;
-            }
-          );
-          break;
-        default:
-          errors.push(`Unknown source type: ${source.sourceType}`);
-          continue;
+  const withHostLimit = createKeyedLimiter(HOST_CONCURRENCY);
+
+  const outcomes = await mapWithConcurrency(
+    interleaveByHost(sources),
+    SOURCE_CONCURRENCY,
+    async (source): Promise<{ result?: IngestResult; error?: string }> => {
+      try {
+        const sourceType = source.sourceType;
+        if (!isSourceType(sourceType)) {
+          return { error: `Unknown source type: ${source.sourceType}` };
+        }
+
+        const result = await withHostLimit(sourceHost(source), () =>
+          ingestors[sourceType](source)
+        );
+
+        return { result };
+      } catch (error) {
+        return {
+          error: `Failed to ingest source ${source.name}: ${error instanceof Error ? error.message : "Unknown error"}`,
+        };
       }
+    }
+  );
 
-      results.push(result);
+  for (const { result, error } of outcomes) {
+    if (result) results.push(result);
+    if (error) errors.push(error);
+  }
 
-      // Update source timestamp
+  // Update timestamps of all ingested sources in one statement
+  if (results.length > 0) {
+    try {
       await db
         .update(schema.sources)
-        .set({ updatedAt: new Date() })
-        .where(eq(schema.sources.id, source.id));
+        .set({ updatedAt: sql`now()` })
+        .where(
+          inArray(
+            schema.sources.id,
+            results.map((r) => r.sourceId)
+          )
+        );
     } catch (error) {
       errors.push(
-        `Failed to ingest source ${source.name}: ${error instanceof Error ? error.message : "Unknown error"}`
+        `Failed to update source timestamps: ${error instanceof Error ? error.message : "Unknown error"}`
       );
     }
   }
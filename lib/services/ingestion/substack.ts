@@ -1,16 +1,15 @@
 import Parser from "rss-parser";
 import { db, schema } from "@/lib/db";
-import { eq, and } from "drizzle-orm";
+import { eq } from "drizzle-orm";
 import crypto from "crypto";
-
-export interface IngestResult {
-  sourceId: number;
-  itemsFound: number;
-  itemsNew: number;
-  itemsSkipped: number;
-  itemsFailed: number;
-  errors: string[];
-}
+import {
+  createIngestResult,
+  findExistingItems,
+  htmlToText,
+  insertContentItems,
+  type IngestResult,
+  type NewContentItem,
+} from "./common";
 
 interface SubstackConfig {
   feedUrl: string;
@@ -25,59 +24,87 @@ const parser = new Parser({
   },
 });
 
-function htmlToText(html: string): string {
-  return html
-    .replace(/<script[^>]*>[\s\S]*?<\/script>/gi, "")
-    .replace(/<style[^>]*>[\s\S]*?<\/style>/gi, "")
-    .replace(/<[^>]+>/g, " ")
-    .replace(/&nbsp;/g, " ")
-    .replace(/&amp;/g, "&")
-    .replace(/&lt;/g, "<")
-    .replace(/&gt;/g, ">")
-    .replace(/&quot;/g, '"')
-    .replace(/&#39;/g, "'")
-    .replace(/\s+/g, " ")
-    .trim();
+// Fail a stalled feed instead of holding up the rest of the run
+const FEED_TIMEOUT_MS = 30_000;
+
+// Sent on every feed request. Some feed hosts and CDNs reject or throttle
+// Node's default user agent, which parseURL used to replace with its own.
+const FEED_HEADERS = {
+  "User-Agent": "Mozilla/5.0 (compatible; WeeklyIntel/1.0; RSS reader)",
+  Accept:
+    "application/rss+xml, application/atom+xml, application/xml, text/xml;q=0.9, */*;q=0.8",
+};
+
+export interface FeedValidators {
+  etag: string | null;
+  lastModified: string | null;
+}
+
+// The feed is downloaded with fetch, whose pooled keep-alive connections are
+// shared by every source fetched in the run, and only parsing is left to
+// rss-parser (its parseURL opens a fresh connection per feed). Passing the
+// validators from the previous fetch makes it a conditional GET; null means
+// the feed hasn't changed (304).
+async function fetchFeed(feedUrl: string, validators?: FeedValidators) {
+  const headers: Record<string, string> = { ...FEED_HEADERS };
+  if (validators?.etag) headers["If-None-Match"] = validators.etag;
+  if (validators?.lastModified) {
+    headers["If-Modified-Since"] = validators.lastModified;
+  }
+
+  const response = await fetch(feedUrl, {
+    headers,
+    signal: AbortSignal.timeout(FEED_TIMEOUT_MS),
+  });
+  if (response.status === 304) return null;
+  if (!response.ok) {
+    throw new Error(`Status code ${response.status}`);
+  }
+
+  return {
+    feed: await parser.parseString(await response.text()),
+    validators: {
+      etag: response.headers.get("etag"),
+      lastModified: response.headers.get("last-modified"),
+    },
+  };
 }
 
 export async function ingestSubstack(
   sourceId: number,
   config: SubstackConfig,
-  force = false
+  force = false,
+  validators?: FeedValidators
 ): Promise<IngestResult> {
-  const result: IngestResult = {
-    sourceId,
-    itemsFound: 0,
-    itemsNew: 0,
-    itemsSkipped: 0,
-    itemsFailed: 0,
-    errors: [],
-  };
+  const result = createIngestResult(sourceId);
 
   try {
-    const feed = await parser.parseURL(config.feedUrl);
+    const fetched = await fetchFeed(
+      config.feedUrl,
+      force ? undefined : validators
+    );
+    if (!fetched) return result;
+
+    const { feed } = fetched;
     result.itemsFound = feed.items.length;
 
-    for (const item of feed.items) {
+    // New items are collected and inserted in bulk after the loop
+    const newItems: NewContentItem[] = [];
+
+    // Generate external IDs and look up the ones we already have at once
+    const externalIds = feed.items.map(
+      (item) =>
+        item.guid ||
+        crypto.createHash("sha256").update(item.link || "").digest("hex")
+    );
+    const existingIds = await findExistingItems(sourceId, externalIds);
+
+    for (const [index, item] of feed.items.entries()) {
       try {
-        // Generate external ID
-        const externalId =
-          item.guid ||
-          crypto.createHash("sha256").update(item.link || "").digest("hex");
-
-        // Check if exists
-        const existing = await db
-          .select()
-          .from(schema.contentItems)
-          .where(
-            and(
-              eq(schema.contentItems.sourceId, sourceId),
-              eq(schema.contentItems.externalId, externalId)
-            )
-          )
-          .limit(1);
-
-        if (existing.length > 0 && !force) {
+        const externalId = externalIds[index];
+        const existingId = existingIds.get(externalId);
+
+        if (existingId !== undefined && !force) {
           result.itemsSkipped++;
           continue;
         }
@@ -95,15 +122,17 @@ export async function ingestSubstack(
           feed.title ||
           "";
 
-        // Parse published date
+        // Parse published date. rss-parser already normalizes the feed date
+        // to isoDate, which parses on the fast ISO 8601 path; pubDate (RFC
+        // 822) is only a fallback for dates it couldn't normalize.
         let publishedAt: Date | null = null;
-        if (item.pubDate) {
-          publishedAt = new Date(item.pubDate);
-        } else if (item.isoDate) {
+        if (item.isoDate) {
           publishedAt = new Date(item.isoDate);
+        } else if (item.pubDate) {
+          publishedAt = new Date(item.pubDate);
         }
 
-        if (existing.length > 0 && force) {
+        if (existingId !== undefined) {
           // Update existing
           await db
             .update(schema.contentItems)
@@ -115,11 +144,10 @@ export async function ingestSubstack(
               url: item.link || null,
               publishedAt,
             })
-            .where(eq(schema.contentItems.id, existing[0].id));
+            .where(eq(schema.contentItems.id, existingId));
           result.itemsNew++;
         } else {
-          // Insert new
-          await db.insert(schema.contentItems).values({
+          newItems.push({
             sourceId,
             externalId,
             title: item.title || null,
@@ -129,7 +157,6 @@ export async function ingestSubstack(
             url: item.link || null,
             publishedAt,
           });
-          result.itemsNew++;
         }
       } catch (error) {
         result.itemsFailed++;
@@ -138,6 +165,36 @@ export async function ingestSubstack(
         );
       }
     }
+
+    if (newItems.length > 0) {
+      try {
+        const inserted = await insertContentItems(newItems);
+        result.itemsNew += inserted;
+        // Conflicting rows already existed (or repeated within the feed)
+        result.itemsSkipped += newItems.length - inserted;
+      } catch (error) {
+        result.itemsFailed += newItems.length;
+        result.errors.push(
+          `Failed to insert items: ${error instanceof Error ? error.message : "Unknown error"}`
+        );
+      }
+    }
+
+    // Only remember the validators once every item made it in, so a failed
+    // run refetches the feed instead of getting a 304
+    if (
+      result.itemsFailed === 0 &&
+      (fetched.validators.etag !== (validators?.etag ?? null) ||
+        fetched.validators.lastModified !== (validators?.lastModified ?? null))
+    ) {
+      await db
+        .update(schema.sources)
+        .set({
+          feedEtag: fetched.validators.etag,
+          feedLastModified: fetched.validators.lastModified,
+        })
+        .where(eq(schema.sources.id, sourceId));
+    }
   } catch (error) {
     result.errors.push(
       `Failed to fetch feed: ${error instanceof Error ? error.message : "Unknown error"}`
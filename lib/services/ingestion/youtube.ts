@@ -1,14 +1,13 @@
 import { db, schema } from "@/lib/db";
-import { eq, and } from "drizzle-orm";
-
-export interface IngestResult {
-  sourceId: number;
-  itemsFound: number;
-  itemsNew: number;
-  itemsSkipped: number;
-  itemsFailed: number;
-  errors: string[];
-}
+import { eq } from "drizzle-orm";
+import { mapWithConcurrency } from "../concurrency";
+import {
+  createIngestResult,
+  findExistingItems,
+  insertContentItems,
+  type IngestResult,
+  type NewContentItem,
+} from "./common";
 
 interface YouTubeConfig {
   channelId?: string;
@@ -20,14 +19,37 @@ interface YouTubeConfig {
   maxVideos?: number;
 }
 
+// Patterns are compiled once at module load rather than on every call
+const VIDEO_ID_PATTERNS = [
+  /(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/|youtube\.com\/shorts\/)([a-zA-Z0-9_-]{11})/,
+  /^([a-zA-Z0-9_-]{11})$/,
+];
+const CHANNEL_ID_PATTERNS = [
+  /youtube\.com\/channel\/([a-zA-Z0-9_-]+)/,
+  /youtube\.com\/@([a-zA-Z0-9_-]+)/,
+  /youtube\.com\/c\/([a-zA-Z0-9_-]+)/,
+];
+const PLAYLIST_ID_PATTERN = /[?&]list=([a-zA-Z0-9_-]+)/;
+// Global patterns are only used through matchAll, which iterates over a
+// copy, so sharing them never leaks lastIndex between calls
+const PLAYLIST_VIDEO_ID_PATTERN = /"videoId":"([a-zA-Z0-9_-]{11})"/g;
+const FEED_VIDEO_ID_PATTERN = /<yt:videoId>([a-zA-Z0-9_-]{11})<\/yt:videoId>/g;
+const CAPTION_TRACK_PATTERN = /"captionTracks":\[.*?"baseUrl":"([^"]+)"/;
+const CAPTION_TEXT_PATTERN = /<text[^>]*>([^<]*)<\/text>/g;
+// Caption text is often double-escaped (&amp;#39;), so &amp; is decoded
+// first and the rest in one pass over the result
+const CAPTION_AMP_PATTERN = /&amp;/g;
+const CAPTION_ENTITY_PATTERN = /&(?:lt|gt|#39|quot);/g;
+const CAPTION_ENTITIES: Record<string, string> = {
+  "&lt;": "<",
+  "&gt;": ">",
+  "&#39;": "'",
+  "&quot;": '"',
+};
+
 // Extract video ID from various YouTube URL formats
 function extractVideoId(url: string): string | null {
-  const patterns = [
-    /(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/|youtube\.com\/shorts\/)([a-zA-Z0-9_-]{11})/,
-    /^([a-zA-Z0-9_-]{11})$/,
-  ];
-
-  for (const pattern of patterns) {
+  for (const pattern of VIDEO_ID_PATTERNS) {
     const match = url.match(pattern);
     if (match) return match[1];
   }
@@ -36,13 +58,7 @@ function extractVideoId(url: string): string | null {
 
 // Extract channel ID from URL
 function extractChannelId(url: string): string | null {
-  const patterns = [
-    /youtube\.com\/channel\/([a-zA-Z0-9_-]+)/,
-    /youtube\.com\/@([a-zA-Z0-9_-]+)/,
-    /youtube\.com\/c\/([a-zA-Z0-9_-]+)/,
-  ];
-
-  for (const pattern of patterns) {
+  for (const pattern of CHANNEL_ID_PATTERNS) {
     const match = url.match(pattern);
     if (match) return match[1];
   }
@@ -51,35 +67,41 @@ function extractChannelId(url: string): string | null {
 
 // Extract playlist ID from URL
 function extractPlaylistId(url: string): string | null {
-  const match = url.match(/[?&]list=([a-zA-Z0-9_-]+)/);
+  const match = url.match(PLAYLIST_ID_PATTERN);
   return match ? match[1] : null;
 }
 
-// Fetch video IDs from a playlist by scraping the page
-async function fetchPlaylistVideos(playlistId: string): Promise<string[]> {
+// Fetch up to `limit` video IDs from a playlist by scraping the page
+async function fetchPlaylistVideos(
+  playlistId: string,
+  limit: number
+): Promise<string[]> {
   try {
     const response = await fetch(
       `https://www.youtube.com/playlist?list=${playlistId}`
     );
     const html = await response.text();
 
-    // Extract video IDs from the page HTML
-    const videoIds: string[] = [];
-    const regex = /"videoId":"([a-zA-Z0-9_-]{11})"/g;
-    let match;
-    while ((match = regex.exec(html)) !== null) {
-      if (!videoIds.includes(match[1])) {
-        videoIds.push(match[1]);
-      }
+    // Extract video IDs from the page HTML. Each ID appears many times on
+    // the page; a Set drops repeats in constant time and keeps first-seen
+    // order
+    const videoIds = new Set<string>();
+    for (const match of html.matchAll(PLAYLIST_VIDEO_ID_PATTERN)) {
+      videoIds.add(match[1]);
+      // Later IDs would be cut by maxVideos anyway, so stop scanning
+      if (videoIds.size >= limit) break;
     }
-    return videoIds;
+    return Array.from(videoIds);
   } catch {
     return [];
   }
 }
 
-// Fetch video IDs from a channel RSS feed
-async function fetchChannelVideos(channelId: string): Promise<string[]> {
+// Fetch up to `limit` video IDs from a channel RSS feed
+async function fetchChannelVideos(
+  channelId: string,
+  limit: number
+): Promise<string[]> {
   try {
     const response = await fetch(
       `https://www.youtube.com/feeds/videos.xml?channel_id=${channelId}`
@@ -87,10 +109,9 @@ async function fetchChannelVideos(channelId: string): Promise<string[]> {
     const xml = await response.text();
 
     const videoIds: string[] = [];
-    const regex = /<yt:videoId>([a-zA-Z0-9_-]{11})<\/yt:videoId>/g;
-    let match;
-    while ((match = regex.exec(xml)) !== null) {
+    for (const match of xml.matchAll(FEED_VIDEO_ID_PATTERN)) {
       videoIds.push(match[1]);
+      if (videoIds.length >= limit) break;
     }
     return videoIds;
   } catch {
@@ -126,7 +147,7 @@ async function fetchTranscript(videoId: string): Promise<string | null> {
     const html = await watchResponse.text();
 
     // Find caption track URL
-    const captionMatch = html.match(/"captionTracks":\[.*?"baseUrl":"([^"]+)"/);
+    const captionMatch = html.match(CAPTION_TRACK_PATTERN);
     if (!captionMatch) return null;
 
     const captionUrl = captionMatch[1].replace(/\\u0026/g, "&");
@@ -134,16 +155,11 @@ async function fetchTranscript(videoId: string): Promise<string | null> {
     const captionXml = await captionResponse.text();
 
     // Parse caption XML to extract text
-    const textRegex = /<text[^>]*>([^<]*)<\/text>/g;
     const texts: string[] = [];
-    let match;
-    while ((match = textRegex.exec(captionXml)) !== null) {
+    for (const match of captionXml.matchAll(CAPTION_TEXT_PATTERN)) {
       const text = match[1]
-        .replace(/&amp;/g, "&")
-        .replace(/&lt;/g, "<")
-        .replace(/&gt;/g, ">")
-        .replace(/&#39;/g, "'")
-        .replace(/&quot;/g, '"')
+        .replace(CAPTION_AMP_PATTERN, "&")
+        .replace(CAPTION_ENTITY_PATTERN, (entity) => CAPTION_ENTITIES[entity])
         .trim();
       if (text) texts.push(text);
     }
@@ -154,19 +170,58 @@ async function fetchTranscript(videoId: string): Promise<string | null> {
   }
 }
 
+// oEmbed data and transcripts don't change once a video is up, so lookups
+// are cached for the life of the process. That covers a video listed by
+// several sources, or retried by a later run on the same instance. Misses
+// (private videos, disabled captions, throttling) expire sooner.
+const METADATA_TTL_MS = 24 * 60 * 60_000;
+const TRANSCRIPT_TTL_MS = 7 * 24 * 60 * 60_000;
+const MISS_TTL_MS = 60 * 60_000;
+const VIDEO_CACHE_SIZE = 1000;
+
+function cacheByVideoId<T>(
+  fetchFn: (videoId: string) => Promise<T | null>,
+  ttlMs: number
+): (videoId: string) => Promise<T | null> {
+  // Promises are cached so concurrent lookups of a video share one request
+  const cache = new Map<
+    string,
+    { value: Promise<T | null>; expiresAt: number }
+  >();
+
+  return (videoId) => {
+    const now = Date.now();
+    const hit = cache.get(videoId);
+    if (hit && hit.expiresAt > now) return hit.value;
+
+    // Evict the oldest entry once full; Map iterates in insertion order
+    cache.delete(videoId);
+    if (cache.size >= VIDEO_CACHE_SIZE) {
+      cache.delete(cache.keys().next().value!);
+    }
+
+    const entry = { value: fetchFn(videoId), expiresAt: now + ttlMs };
+    cache.set(videoId, entry);
+    entry.value.then((value) => {
+      if (value === null) entry.expiresAt = Date.now() + MISS_TTL_MS;
+    });
+    return entry.value;
+  };
+}
+
+const getVideoMetadata = cacheByVideoId(fetchVideoMetadata, METADATA_TTL_MS);
+const getTranscript = cacheByVideoId(fetchTranscript, TRANSCRIPT_TTL_MS);
+
+// Videos processed at once; each fetches its metadata and transcript in
+// parallel, so up to twice as many requests are in flight
+const VIDEO_FETCH_CONCURRENCY = 8;
+
 export async function ingestYouTube(
   sourceId: number,
   config: YouTubeConfig,
   force = false
 ): Promise<IngestResult> {
-  const result: IngestResult = {
-    sourceId,
-    itemsFound: 0,
-    itemsNew: 0,
-    itemsSkipped: 0,
-    itemsFailed: 0,
-    errors: [],
-  };
+  const result = createIngestResult(sourceId);
 
   const videoIds: string[] = [];
   const maxVideos = config.maxVideos || 20;
@@ -184,27 +239,30 @@ export async function ingestYouTube(
   }
 
   if (config.playlistId) {
-    const playlistVideos = await fetchPlaylistVideos(config.playlistId);
+    const playlistVideos = await fetchPlaylistVideos(
+      config.playlistId,
+      maxVideos
+    );
     videoIds.push(...playlistVideos);
   }
 
   if (config.playlistUrl) {
     const playlistId = extractPlaylistId(config.playlistUrl);
     if (playlistId) {
-      const playlistVideos = await fetchPlaylistVideos(playlistId);
+      const playlistVideos = await fetchPlaylistVideos(playlistId, maxVideos);
       videoIds.push(...playlistVideos);
     }
   }
 
   if (config.channelId) {
-    const channelVideos = await fetchChannelVideos(config.channelId);
+    const channelVideos = await fetchChannelVideos(config.channelId, maxVideos);
     videoIds.push(...channelVideos);
   }
 
   if (config.channelUrl) {
     const channelId = extractChannelId(config.channelUrl);
     if (channelId) {
-      const channelVideos = await fetchChannelVideos(channelId);
+      const channelVideos = await fetchChannelVideos(channelId, maxVideos);
       videoIds.push(...channelVideos);
     }
   }
@@ -213,64 +271,77 @@ export async function ingestYouTube(
   const uniqueVideoIds = [...new Set(videoIds)].slice(0, maxVideos);
   result.itemsFound = uniqueVideoIds.length;
 
-  for (const videoId of uniqueVideoIds) {
-    try {
-      // Check if exists
-      const existing = await db
-        .select()
-        .from(schema.contentItems)
-        .where(
-          and(
-            eq(schema.contentItems.sourceId, sourceId),
-            eq(schema.contentItems.externalId, videoId)
-          )
-        )
-        .limit(1);
-
-      if (existing.length > 0 && !force) {
-        result.itemsSkipped++;
-        continue;
-      }
-
-      // Fetch metadata and transcript
-      const metadata = await fetchVideoMetadata(videoId);
-      const transcript = await fetchTranscript(videoId);
-
-      if (!metadata && !transcript) {
-        result.itemsFailed++;
-        result.errors.push(`Failed to fetch data for video ${videoId}`);
-        continue;
-      }
-
-      const videoUrl = `https://www.youtube.com/watch?v=${videoId}`;
-
-      if (existing.length > 0 && force) {
-        await db
-          .update(schema.contentItems)
-          .set({
+  // Look up already-ingested videos in one query and only fetch the rest
+  const existingIds = await findExistingItems(sourceId, uniqueVideoIds);
+  const toFetch = force
+    ? uniqueVideoIds
+    : uniqueVideoIds.filter((videoId) => !existingIds.has(videoId));
+  result.itemsSkipped += uniqueVideoIds.length - toFetch.length;
+
+  // New videos are collected and inserted in bulk once all are fetched
+  const newItems: NewContentItem[] = [];
+
+  await mapWithConcurrency(
+    toFetch,
+    VIDEO_FETCH_CONCURRENCY,
+    async (videoId) => {
+      try {
+        // Fetch metadata and transcript
+        const [metadata, transcript] = await Promise.all([
+          getVideoMetadata(videoId),
+          getTranscript(videoId),
+        ]);
+
+        if (!metadata && !transcript) {
+          result.itemsFailed++;
+          result.errors.push(`Failed to fetch data for video ${videoId}`);
+          return;
+        }
+
+        const videoUrl = `https://www.youtube.com/watch?v=${videoId}`;
+
+        const existingId = existingIds.get(videoId);
+        if (existingId !== undefined) {
+          await db
+            .update(schema.contentItems)
+            .set({
+              title: metadata?.title || null,
+              author: metadata?.author || null,
+              contentText: transcript || null,
+              url: videoUrl,
+            })
+            .where(eq(schema.contentItems.id, existingId));
+          result.itemsNew++;
+        } else {
+          newItems.push({
+            sourceId,
+            externalId: videoId,
             title: metadata?.title || null,
             author: metadata?.author || null,
             contentText: transcript || null,
             url: videoUrl,
-          })
-          .where(eq(schema.contentItems.id, existing[0].id));
-        result.itemsNew++;
-      } else {
-        await db.insert(schema.contentItems).values({
-          sourceId,
-          externalId: videoId,
-          title: metadata?.title || null,
-          author: metadata?.author || null,
-          contentText: transcript || null,
-          url: videoUrl,
-          publishedAt: new Date(),
-        });
-        result.itemsNew++;
+            publishedAt: new Date(),
+          });
+        }
+      } catch (error) {
+        result.itemsFailed++;
+        result.errors.push(
+          `Failed to process video ${videoId}: ${error instanceof Error ? error.message : "Unknown error"}`
+        );
       }
+    }
+  );
+
+  if (newItems.length > 0) {
+    try {
+      const inserted = await insertContentItems(newItems);
+      result.itemsNew += inserted;
+      // Conflicting rows were stored by a concurrent run
+      result.itemsSkipped += newItems.length - inserted;
     } catch (error) {
-      result.itemsFailed++;
+      result.itemsFailed += newItems.length;
       result.errors.push(
-        `Failed to process video ${videoId}: ${error instanceof Error ? error.message : "Unknown error"}`
+        `Failed to insert videos: ${error instanceof Error ? error.message : "Unknown error"}`
       );
     }
   }
@@ -1,4 +1,4 @@
-import { cosineSimilarityMatrix, cosineSimilarity } from "./embeddings";
+import { dot, normalizeRows, unitSimilarityMatrix } from "./embeddings";
 
 export interface Cluster {
   indices: number[];
@@ -10,6 +10,46 @@ export interface ClusteringResult {
   clusters: Cluster[];
   labels: number[]; // cluster index for each item, -1 for noise
   noiseIndices: number[];
+  // Unit-length copies of the embeddings, computed once by clusterItems and
+  // reused by mergeClusters
+  normalized?: Float32Array[];
+}
+
+// Mean of the member embeddings, summed row by row into a typed buffer
+function computeCentroid(indices: number[], embeddings: number[][]): number[] {
+  const sum = new Float64Array(embeddings[indices[0]].length);
+  for (const idx of indices) {
+    const row = embeddings[idx];
+    for (let k = 0; k < sum.length; k++) {
+      sum[k] += row[k];
+    }
+  }
+
+  const centroid = new Array<number>(sum.length);
+  for (let k = 0; k < sum.length; k++) {
+    centroid[k] = sum[k] / indices.length;
+  }
+  return centroid;
+}
+
+// The member closest to the centroid. Ranking by dot product with the unit
+// embeddings matches ranking by cosine, since the centroid's norm is the
+// same for every member
+function findRepresentative(
+  indices: number[],
+  normalized: Float32Array[],
+  centroid: number[]
+): number {
+  let representativeIdx = indices[0];
+  let maxSim = -1;
+  for (const idx of indices) {
+    const sim = dot(normalized[idx], centroid);
+    if (sim > maxSim) {
+      maxSim = sim;
+      representativeIdx = idx;
+    }
+  }
+  return representativeIdx;
 }
 
 // Threshold-based clustering (serverless-friendly alternative to HDBSCAN)
@@ -30,7 +70,8 @@ export function clusterItems(
   }
 
   // Compute similarity matrix
-  const simMatrix = cosineSimilarityMatrix(embeddings);
+  const normalized = normalizeRows(embeddings);
+  const simMatrix = unitSimilarityMatrix(normalized);
 
   // Track assigned items
   const assigned = new Set<number>();
@@ -47,15 +88,15 @@ export function clusterItems(
     for (let j = i + 1; j < n; j++) {
       if (assigned.has(j)) continue;
 
-      // Check if item j is similar to any existing cluster member
-      let maxSim = 0;
+      // Check if item j is similar to any existing cluster member, stopping
+      // at the first one over the threshold rather than taking the max
+      // over all of them
       for (const memberIdx of clusterMembers) {
-        maxSim = Math.max(maxSim, simMatrix[memberIdx][j]);
-      }
-
-      if (maxSim >= threshold) {
-        clusterMembers.push(j);
-        assigned.add(j);
+        if (simMatrix[memberIdx][j] >= threshold) {
+          clusterMembers.push(j);
+          assigned.add(j);
+          break;
+        }
       }
     }
 
@@ -63,27 +104,12 @@ export function clusterItems(
     if (clusterMembers.length >= 2) {
       const clusterIdx = clusters.length;
 
-      // Compute centroid
-      const centroid = new Array(embeddings[0].length).fill(0);
-      for (const idx of clusterMembers) {
-        for (let k = 0; k < centroid.length; k++) {
-          centroid[k] += embeddings[idx][k];
-        }
-      }
-      for (let k = 0; k < centroid.length; k++) {
-        centroid[k] /= clusterMembers.length;
-      }
-
-      // Find representative (closest to centroid)
-      let representativeIdx = clusterMembers[0];
-      let maxSimToCentroid = -1;
-      for (const idx of clusterMembers) {
-        const sim = cosineSimilarity(embeddings[idx], centroid);
-        if (sim > maxSimToCentroid) {
-          maxSimToCentroid = sim;
-          representativeIdx = idx;
-        }
-      }
+      const centroid = computeCentroid(clusterMembers, embeddings);
+      const representativeIdx = findRepresentative(
+        clusterMembers,
+        normalized,
+        centroid
+      );
 
       // Assign labels
       for (const idx of clusterMembers) {
@@ -109,7 +135,7 @@ export function clusterItems(
     }
   }
 
-  return { clusters, labels, noiseIndices };
+  return { clusters, labels, noiseIndices, normalized };
 }
 
 // Merge similar clusters
@@ -124,6 +150,12 @@ export function mergeClusters(
     return result;
   }
 
+  const normalized = result.normalized ?? normalizeRows(embeddings);
+
+  // Normalize centroids once, so each comparison below is a plain dot
+  // product instead of a cosine that recomputes both norms
+  const unitCentroids = normalizeRows(clusters.map((c) => c.centroid));
+
   // Check which clusters should be merged
   const mergeGroups: number[][] = [];
   const processed = new Set<number>();
@@ -137,7 +169,7 @@ export function mergeClusters(
     for (let j = i + 1; j < clusters.length; j++) {
       if (processed.has(j)) continue;
 
-      const sim = cosineSimilarity(clusters[i].centroid, clusters[j].centroid);
+      const sim = dot(unitCentroids[i], unitCentroids[j]);
       if (sim >= mergeThreshold) {
         group.push(j);
         processed.add(j);
@@ -154,45 +186,49 @@ export function mergeClusters(
   for (const group of mergeGroups) {
     const newClusterIdx = newClusters.length;
 
-    // Collect all members
-    const allIndices: number[] = [];
-    for (const clusterIdx of group) {
-      allIndices.push(...clusters[clusterIdx].indices);
-    }
-
-    // Compute new centroid
-    const centroid = new Array(embeddings[0].length).fill(0);
-    for (const idx of allIndices) {
-      for (let k = 0; k < centroid.length; k++) {
-        centroid[k] += embeddings[idx][k];
+    // A cluster that merges with nothing keeps its members, centroid and
+    // representative as they are
+    let merged: Cluster;
+    if (group.length === 1) {
+      merged = clusters[group[0]];
+    } else {
+      // Collect all members
+      const allIndices: number[] = [];
+      for (const clusterIdx of group) {
+        allIndices.push(...clusters[clusterIdx].indices);
       }
-    }
-    for (let k = 0; k < centroid.length; k++) {
-      centroid[k] /= allIndices.length;
-    }
 
-    // Find new representative
-    let representativeIdx = allIndices[0];
-    let maxSim = -1;
-    for (const idx of allIndices) {
-      const sim = cosineSimilarity(embeddings[idx], centroid);
-      if (sim > maxSim) {
-        maxSim = sim;
-        representativeIdx = idx;
+      // The merged centroid is the size-weighted mean of the group's
+      // centroids, which avoids summing every member embedding again
+      const dimension = clusters[group[0]].centroid.length;
+      const centroid = new Array<number>(dimension).fill(0);
+      for (const clusterIdx of group) {
+        const { centroid: part, indices } = clusters[clusterIdx];
+        const weight = indices.length / allIndices.length;
+        for (let k = 0; k < centroid.length; k++) {
+          centroid[k] += part[k] * weight;
+        }
       }
+
+      merged = {
+        indices: allIndices,
+        centroid,
+        representativeIdx: findRepresentative(allIndices, normalized, centroid),
+      };
     }
 
     // Update labels
-    for (const idx of allIndices) {
+    for (const idx of merged.indices) {
       newLabels[idx] = newClusterIdx;
     }
 
-    newClusters.push({
-      indices: allIndices,
-      centroid,
-      representativeIdx,
-    });
+    newClusters.push(merged);
   }
 
-  return { clusters: newClusters, labels: newLabels, noiseIndices };
+  return {
+    clusters: newClusters,
+    labels: newLabels,
+    noiseIndices,
+    normalized,
+  };
 }
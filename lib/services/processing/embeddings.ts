@@ -1,95 +1,185 @@
-import OpenAI from "openai";
+import type OpenAI from "openai";
 import { config } from "@/lib/config";
 
 let openaiClient: OpenAI | null = null;
 
-function getOpenAI(): OpenAI {
+// The SDK is imported on first use so unrelated routes don't load it
+async function getOpenAI(): Promise<OpenAI> {
   if (!openaiClient) {
-    openaiClient = new OpenAI({
+    const { default: OpenAIClient } = await import("openai");
+    openaiClient = new OpenAIClient({
       apiKey: config.openaiApiKey(),
     });
   }
   return openaiClient;
 }
 
-export async function computeEmbedding(text: string): Promise<number[]> {
-  const openai = getOpenAI();
+// One embedding input holds at most ~8000 tokens, roughly 32000 chars.
+// Longer texts are split into overlapping chunks whose embeddings are
+// averaged, rather than dropping everything after the first 32000 chars.
+// Chunks per text are capped to bound the cost of very long transcripts.
+const EMBEDDING_CHUNK_CHARS = 32000;
+const EMBEDDING_CHUNK_OVERLAP = 1000;
+const EMBEDDING_MAX_CHUNKS = 8;
+
+// The embeddings endpoint caps the total tokens of one request (~300k), so
+// large batches are split by size; at ~4 chars per token this stays well
+// under it even when every input is a full chunk
+const EMBEDDING_REQUEST_CHARS = 800_000;
+const EMBEDDING_REQUEST_INPUTS = 2048;
+
+function chunkText(text: string): string[] {
+  if (text.length <= EMBEDDING_CHUNK_CHARS) return [text];
+
+  const chunks: string[] = [];
+  const step = EMBEDDING_CHUNK_CHARS - EMBEDDING_CHUNK_OVERLAP;
+  for (let start = 0; chunks.length < EMBEDDING_MAX_CHUNKS; start += step) {
+    chunks.push(text.slice(start, start + EMBEDDING_CHUNK_CHARS));
+    if (start + EMBEDDING_CHUNK_CHARS >= text.length) break;
+  }
+  return chunks;
+}
 
-  // Truncate text if too long (max ~8000 tokens, roughly 32000 chars)
-  const truncatedText = text.slice(0, 32000);
+// Average chunk embeddings and rescale to unit length, so a pooled
+// embedding compares like a single one
+function meanPool(vectors: number[][]): number[] {
+  if (vectors.length === 1) return vectors[0];
 
-  const response = await openai.embeddings.create({
-    model: config.embeddingModel,
-    input: truncatedText,
-    dimensions: config.embeddingDimension,
-  });
+  const pooled = new Array<number>(vectors[0].length).fill(0);
+  for (const vector of vectors) {
+    for (let k = 0; k < pooled.length; k++) {
+      pooled[k] += vector[k];
+    }
+  }
 
-  return response.data[0].embedding;
+  const norm = Math.sqrt(dot(pooled, pooled));
+  if (norm > 0) {
+    for (let k = 0; k < pooled.length; k++) {
+      pooled[k] /= norm;
+    }
+  }
+  return pooled;
 }
 
-export async function computeEmbeddingsBatch(
-  texts: string[]
-): Promise<number[][]> {
-  const openai = getOpenAI();
+// Embed inputs in as few requests as the endpoint's limits allow
+async function embedInputs(inputs: string[]): Promise<number[][]> {
+  const openai = await getOpenAI();
+
+  const embeddings: number[][] = [];
+  let start = 0;
+  while (start < inputs.length) {
+    let end = start;
+    let chars = 0;
+    while (
+      end < inputs.length &&
+      end - start < EMBEDDING_REQUEST_INPUTS &&
+      (end === start || chars + inputs[end].length <= EMBEDDING_REQUEST_CHARS)
+    ) {
+      chars += inputs[end].length;
+      end++;
+    }
 
-  // Truncate each text
-  const truncatedTexts = texts.map((t) => t.slice(0, 32000));
+    const response = await openai.embeddings.create({
+      model: config.embeddingModel,
+      input: inputs.slice(start, end),
+      dimensions: config.embeddingDimension,
+    });
 
-  const response = await openai.embeddings.create({
-    model: config.embeddingModel,
-    input: truncatedTexts,
-    dimensions: config.embeddingDimension,
-  });
+    // Sort by index to maintain order
+    for (const d of response.data.sort((a, b) => a.index - b.index)) {
+      embeddings.push(d.embedding);
+    }
+    start = end;
+  }
 
-  // Sort by index to maintain order
-  return response.data
-    .sort((a, b) => a.index - b.index)
-    .map((d) => d.embedding);
+  return embeddings;
 }
 
-export function cosineSimilarity(a: number[], b: number[]): number {
-  if (a.length !== b.length) {
-    throw new Error("Vectors must have the same length");
-  }
+export async function computeEmbedding(text: string): Promise<number[]> {
+  const [embedding] = await computeEmbeddingsBatch([text]);
+  return embedding;
+}
 
-  let dot = 0;
-  let normA = 0;
-  let normB = 0;
+export async function computeEmbeddingsBatch(
+  texts: string[]
+): Promise<number[][]> {
+  // Every chunk of every text goes out together; each text then pools the
+  // embeddings of its own chunks
+  const chunked = texts.map(chunkText);
+  const chunkEmbeddings = await embedInputs(chunked.flat());
+
+  let offset = 0;
+  return chunked.map((chunks) => {
+    const pooled = meanPool(
+      chunkEmbeddings.slice(offset, offset + chunks.length)
+    );
+    offset += chunks.length;
+    return pooled;
+  });
+}
 
-  for (let i = 0; i < a.length; i++) {
-    dot += a[i] * b[i];
-    normA += a[i] * a[i];
-    normB += b[i] * b[i];
+// Dot product with four independent accumulators, so the JIT can keep
+// several multiply-adds in flight instead of serializing on one sum
+export function dot(a: ArrayLike<number>, b: ArrayLike<number>): number {
+  const len = a.length;
+  let s0 = 0;
+  let s1 = 0;
+  let s2 = 0;
+  let s3 = 0;
+  let k = 0;
+  for (; k + 3 < len; k += 4) {
+    s0 += a[k] * b[k];
+    s1 += a[k + 1] * b[k + 1];
+    s2 += a[k + 2] * b[k + 2];
+    s3 += a[k + 3] * b[k + 3];
   }
-
-  const magnitude = Math.sqrt(normA) * Math.sqrt(normB);
-  if (magnitude === 0) return 0;
-
-  return dot / magnitude;
+  for (; k < len; k++) {
+    s0 += a[k] * b[k];
+  }
+  return s0 + s1 + s2 + s3;
 }
 
-export function cosineSimilarityMatrix(embeddings: number[][]): number[][] {
-  const n = embeddings.length;
-  const matrix: number[][] = Array.from({ length: n }, () =>
-    Array(n).fill(0)
-  );
-
-  // Pre-normalize all embeddings for efficiency
-  const normalized = embeddings.map((emb) => {
-    const norm = Math.sqrt(emb.reduce((sum, val) => sum + val * val, 0));
-    return norm > 0 ? emb.map((val) => val / norm) : emb;
+// Vectors whose norm is this close to 1 are treated as already normalized;
+// the difference is below float32 resolution
+const UNIT_NORM_TOLERANCE = 1e-7;
+
+// Scale each vector to unit length, into typed arrays that the dot-product
+// loops read much faster than boxed number arrays. Rows are stored as
+// float32: embeddings are kept as halfvec, so the extra precision of
+// float64 carries no information and would only double the memory read by
+// every dot product. Zero vectors stay zero.
+export function normalizeRows(vectors: ArrayLike<number>[]): Float32Array[] {
+  return vectors.map((vector) => {
+    const norm = Math.sqrt(dot(vector, vector));
+    const row = new Float32Array(vector.length);
+    if (Math.abs(norm - 1) <= UNIT_NORM_TOLERANCE) {
+      // Already unit length, as fresh OpenAI embeddings are: copy as-is
+      row.set(vector);
+    } else if (norm > 0) {
+      for (let k = 0; k < row.length; k++) {
+        row[k] = vector[k] / norm;
+      }
+    }
+    return row;
   });
+}
+
+// Cosine similarity of every pair of unit vectors. Only the upper triangle
+// is computed; each value is mirrored into the lower one. Rows are float32
+// to halve the size of the n x n result.
+export function unitSimilarityMatrix(
+  normalized: ArrayLike<number>[]
+): Float32Array[] {
+  const n = normalized.length;
+  const matrix = Array.from({ length: n }, () => new Float32Array(n));
 
-  // Compute dot products (cosine similarity for normalized vectors)
   for (let i = 0; i < n; i++) {
     matrix[i][i] = 1;
+    const rowI = normalized[i];
     for (let j = i + 1; j < n; j++) {
-      let dot = 0;
-      for (let k = 0; k < normalized[i].length; k++) {
-        dot += normalized[i][k] * normalized[j][k];
-      }
-      matrix[i][j] = dot;
-      matrix[j][i] = dot;
+      const sim = dot(rowI, normalized[j]);
+      matrix[i][j] = sim;
+      matrix[j][i] = sim;
     }
   }
 
@@ -1,16 +1,9 @@
-import Anthropic from "@anthropic-ai/sdk";
 import { config } from "@/lib/config";
-
-let anthropicClient: Anthropic | null = null;
-
-function getAnthropic(): Anthropic {
-  if (!anthropicClient) {
-    anthropicClient = new Anthropic({
-      apiKey: config.anthropicApiKey(),
-    });
-  }
-  return anthropicClient;
-}
+import {
+  acquireAnthropicCapacity,
+  estimateTokens,
+  getAnthropic,
+} from "../anthropic";
 
 export interface ExtractionResult {
   summary: string;
@@ -92,6 +85,12 @@ const EXTRACTION_TOOL = {
   },
 };
 
+const EXTRACTION_TOOLS = [EXTRACTION_TOOL];
+const EXTRACTION_TOOL_CHOICE = {
+  type: "tool" as const,
+  name: EXTRACTION_TOOL.name,
+};
+
 const SYSTEM_PROMPT = `You are an expert analyst preparing content for a weekly intelligence digest. 
 Your task is to extract key information, themes, and insights from various content sources.
 Focus on actionable information, notable opinions, and significant developments.
@@ -105,7 +104,7 @@ export async function extractContent(
     sourceType: string;
   }
 ): Promise<ExtractionResult> {
-  const anthropic = getAnthropic();
+  const anthropic = await getAnthropic();
 
   // Truncate content if too long
   const truncatedContent = content.slice(0, 50000);
@@ -118,13 +117,15 @@ export async function extractContent(
 
   const userMessage = `${contextParts.join("\n")}\n\nContent:\n${truncatedContent}`;
 
+  await acquireAnthropicCapacity(estimateTokens(SYSTEM_PROMPT + userMessage));
+
   try {
     const response = await anthropic.messages.create({
       model: config.claudeModel,
       max_tokens: 2048,
       system: SYSTEM_PROMPT,
-      tools: [EXTRACTION_TOOL],
-      tool_choice: { type: "tool", name: "extract_content" },
+      tools: EXTRACTION_TOOLS,
+      tool_choice: EXTRACTION_TOOL_CHOICE,
       messages: [
         {
           role: "user",
@@ -50,26 +50,21 @@ function tokenize(text: string): string[] {
   return shingles;
 }
 
-export interface Fingerprint {
-  version: number;
-  num_perm: number;
-  hashvalues: number[];
-}
+// Signature of a text with no shingles
+const EMPTY_FINGERPRINT = new Uint32Array(NUM_PERM).fill(LARGE_PRIME);
 
-export function computeFingerprint(text: string): string {
+// Fingerprints are kept as the raw MinHash values, which is also how they are
+// stored (see minhash in lib/db/schema.ts), so comparing two needs no parsing
+export function computeFingerprint(text: string): Uint32Array {
   const shingles = tokenize(text);
 
   if (shingles.length === 0) {
     // Return empty fingerprint for very short texts
-    return JSON.stringify({
-      version: 1,
-      num_perm: NUM_PERM,
-      hashvalues: new Array(NUM_PERM).fill(LARGE_PRIME),
-    });
+    return EMPTY_FINGERPRINT.slice();
   }
 
   // Initialize with max values
-  const hashvalues = new Array(NUM_PERM).fill(LARGE_PRIME);
+  const hashvalues = new Uint32Array(NUM_PERM).fill(LARGE_PRIME);
 
   // For each shingle
   for (const shingle of shingles) {
@@ -84,43 +79,31 @@ export function computeFingerprint(text: string): string {
     }
   }
 
-  const fingerprint: Fingerprint = {
-    version: 1,
-    num_perm: NUM_PERM,
-    hashvalues,
-  };
-
-  return JSON.stringify(fingerprint);
+  return hashvalues;
 }
 
 export function computeSimilarityFromFingerprints(
-  fp1: string,
-  fp2: string
+  fp1: Uint32Array,
+  fp2: Uint32Array
 ): number {
-  try {
-    const f1: Fingerprint = JSON.parse(fp1);
-    const f2: Fingerprint = JSON.parse(fp2);
-
-    if (f1.num_perm !== f2.num_perm) {
-      throw new Error("Fingerprints have different number of permutations");
-    }
+  // Signatures with a different number of permutations aren't comparable
+  if (fp1.length !== fp2.length || fp1.length === 0) {
+    return 0;
+  }
 
-    let matches = 0;
-    for (let i = 0; i < f1.num_perm; i++) {
-      if (f1.hashvalues[i] === f2.hashvalues[i]) {
-        matches++;
-      }
+  let matches = 0;
+  for (let i = 0; i < fp1.length; i++) {
+    if (fp1[i] === fp2[i]) {
+      matches++;
     }
-
-    return matches / f1.num_perm;
-  } catch {
-    return 0;
   }
+
+  return matches / fp1.length;
 }
 
 export function areFingerprintsSimilar(
-  fp1: string,
-  fp2: string,
+  fp1: Uint32Array,
+  fp2: Uint32Array,
   threshold: number
 ): boolean {
   return computeSimilarityFromFingerprints(fp1, fp2) >= threshold;
@@ -1,4 +1,5 @@
-import { neon } from "@neondatabase/serverless";
+import { sql } from "drizzle-orm";
+import { db } from "@/lib/db";
 import { config } from "@/lib/config";
 
 export interface NoveltyResult {
@@ -13,28 +14,32 @@ export async function checkNovelty(
   embedding: number[],
   weeksBack: number = config.noveltyWeeks
 ): Promise<NoveltyResult> {
-  const sql = neon(process.env.DATABASE_URL!);
-
   // Calculate cutoff date
   const cutoff = new Date();
   cutoff.setDate(cutoff.getDate() - weeksBack * 7);
 
   // Use pgvector <=> operator for cosine distance
   // Note: <=> returns distance, so similarity = 1 - distance
+  // The window is bounded by the processed_at index and ranked exactly, so
+  // the 10 nearest neighbours are always the nearest ones inside the window
   const embeddingStr = `[${embedding.join(",")}]`;
 
-  const result = await sql`
+  const { rows: result } = await db.execute<{
+    id: number;
+    similarity: number;
+    processed_at: string;
+  }>(sql`
     SELECT 
       id,
-      1 - (embedding <=> ${embeddingStr}::vector) as similarity,
+      1 - (embedding <=> ${embeddingStr}::halfvec) as similarity,
       processed_at
     FROM processed_items
     WHERE id != ${itemId}
       AND processed_at >= ${cutoff.toISOString()}
       AND embedding IS NOT NULL
-    ORDER BY embedding <=> ${embeddingStr}::vector
+    ORDER BY embedding <=> ${embeddingStr}::halfvec
     LIMIT 10
-  `;
+  `);
 
   const similarItems = result.map((row) => ({
     id: row.id as number,
@@ -1,11 +1,12 @@
 import { db, schema } from "@/lib/db";
-import { eq, isNull, sql, and, gte, lte } from "drizzle-orm";
+import { eq, inArray, isNull, sql, and, gte, lte } from "drizzle-orm";
 import { config } from "@/lib/config";
+import { getWeekNumber, getWeekDateRange } from "@/lib/week";
 import {
   computeFingerprint,
   areFingerprintsSimilar,
 } from "./fingerprint";
-import { computeEmbedding } from "./embeddings";
+import { computeEmbedding, computeEmbeddingsBatch } from "./embeddings";
 import { extractContent } from "./extractor";
 import { clusterItems, mergeClusters } from "./clustering";
 import { batchCheckNovelty } from "./novelty";
@@ -19,25 +20,6 @@ export interface ProcessingResult {
   errors: string[];
 }
 
-function getWeekNumber(date: Date): string {
-  const d = new Date(date);
-  d.setHours(0, 0, 0, 0);
-  d.setDate(d.getDate() + 4 - (d.getDay() || 7));
-  const yearStart = new Date(d.getFullYear(), 0, 1);
-  const weekNo = Math.ceil(((d.getTime() - yearStart.getTime()) / 86400000 + 1) / 7);
-  return `${d.getFullYear()}-W${weekNo.toString().padStart(2, "0")}`;
-}
-
-function getWeekDateRange(weekNumber: string): { start: Date; end: Date } {
-  const [year, week] = weekNumber.split("-W").map(Number);
-  const jan1 = new Date(year, 0, 1);
-  const days = (week - 1) * 7 - jan1.getDay() + 1;
-  const start = new Date(year, 0, days + 1);
-  const end = new Date(start);
-  end.setDate(end.getDate() + 6);
-  return { start, end };
-}
-
 export async function processNewItems(
   weekNumber?: string,
   batchSize = 10
@@ -82,40 +64,52 @@ export async function processNewItems(
   // Compute fingerprints for items missing them
   const itemsWithFingerprints: {
     item: typeof unprocessedItems[0];
-    fingerprint: string;
+    fingerprint: Uint32Array | null;
   }[] = [];
 
+  const newFingerprints: { id: number; fingerprint: Uint32Array }[] = [];
+
   for (const row of unprocessedItems) {
     const content = row.content.contentText || "";
     let fingerprint = row.content.fingerprint;
 
     if (!fingerprint && content.length > 0) {
       fingerprint = computeFingerprint(content);
-      await db
-        .update(schema.contentItems)
-        .set({ fingerprint })
-        .where(eq(schema.contentItems.id, row.content.id));
+      newFingerprints.push({ id: row.content.id, fingerprint });
     }
 
     itemsWithFingerprints.push({
       item: row,
-      fingerprint: fingerprint || "",
+      fingerprint: fingerprint ?? null,
     });
   }
 
+  // Send all fingerprint updates in one round trip
+  if (newFingerprints.length > 0) {
+    const [first, ...rest] = newFingerprints.map(({ id, fingerprint }) =>
+      db
+        .update(schema.contentItems)
+        .set({ fingerprint })
+        .where(eq(schema.contentItems.id, id))
+    );
+    await db.batch([first, ...rest]);
+  }
+
   // Find duplicates by comparing fingerprints within batch
   const duplicateIds = new Set<number>();
   for (let i = 0; i < itemsWithFingerprints.length; i++) {
     if (duplicateIds.has(itemsWithFingerprints[i].item.content.id)) continue;
-    if (!itemsWithFingerprints[i].fingerprint) continue;
+    const fingerprintI = itemsWithFingerprints[i].fingerprint;
+    if (!fingerprintI) continue;
 
     for (let j = i + 1; j < itemsWithFingerprints.length; j++) {
-      if (!itemsWithFingerprints[j].fingerprint) continue;
+      const fingerprintJ = itemsWithFingerprints[j].fingerprint;
+      if (!fingerprintJ) continue;
 
       if (
         areFingerprintsSimilar(
-          itemsWithFingerprints[i].fingerprint,
-          itemsWithFingerprints[j].fingerprint,
+          fingerprintI,
+          fingerprintJ,
           config.fingerprintThreshold
         )
       ) {
@@ -132,6 +126,28 @@ export async function processNewItems(
     contentItemId: number;
   }[] = [];
 
+  // Embed every item that will be processed up front, in as few requests as
+  // possible rather than one request per item. If that fails, items fall
+  // back to embedding themselves one at a time below.
+  const batchEmbeddings = new Map<number, number[]>();
+  const toEmbed = itemsWithFingerprints.filter(
+    ({ item }) =>
+      !duplicateIds.has(item.content.id) &&
+      (item.content.contentText || "").length >= 50
+  );
+  if (toEmbed.length > 0) {
+    try {
+      const embeddings = await computeEmbeddingsBatch(
+        toEmbed.map(({ item }) => item.content.contentText || "")
+      );
+      toEmbed.forEach(({ item }, i) =>
+        batchEmbeddings.set(item.content.id, embeddings[i])
+      );
+    } catch {
+      // Handled per item
+    }
+  }
+
   for (const { item, fingerprint } of itemsWithFingerprints) {
     if (duplicateIds.has(item.content.id)) {
       result.itemsSkipped++;
@@ -153,7 +169,9 @@ export async function processNewItems(
       });
 
       // Compute embedding
-      const embedding = await computeEmbedding(content);
+      const embedding =
+        batchEmbeddings.get(item.content.id) ??
+        (await computeEmbedding(content));
 
       // Save processed item
       const [inserted] = await db
@@ -188,17 +206,22 @@ export async function processNewItems(
   if (processedItemsData.length > 0) {
     const noveltyResults = await batchCheckNovelty(processedItemsData);
 
+    const followupIds: number[] = [];
     for (const [itemId, novelty] of noveltyResults) {
       if (novelty.isFollowup) {
-        // Update key information to mark as follow-up
-        await db
-          .update(schema.processedItems)
-          .set({
-            keyInformation: sql`array_prepend('[Follow-up story]', ${schema.processedItems.keyInformation})`,
-          })
-          .where(eq(schema.processedItems.id, itemId));
+        followupIds.push(itemId);
       }
     }
+
+    if (followupIds.length > 0) {
+      // Update key information to mark as follow-up
+      await db
+        .update(schema.processedItems)
+        .set({
+          keyInformation: sql`array_prepend('[Follow-up story]', ${schema.processedItems.keyInformation})`,
+        })
+        .where(inArray(schema.processedItems.id, followupIds));
+    }
   }
 
   // Cluster items if we have enough
@@ -223,16 +246,13 @@ export async function processNewItems(
         .returning();
 
       // Save cluster members
-      for (const idx of cluster.indices) {
-        const processedItem = processedItemsData[idx];
-        const similarity = idx === cluster.representativeIdx ? 1.0 : 0.85;
-
-        await db.insert(schema.clusterMembers).values({
+      await db.insert(schema.clusterMembers).values(
+        cluster.indices.map((idx) => ({
           clusterId: storyCluster.id,
-          processedItemId: processedItem.id,
-          similarityScore: similarity,
-        });
-      }
+          processedItemId: processedItemsData[idx].id,
+          similarityScore: idx === cluster.representativeIdx ? 1.0 : 0.85,
+        }))
+      );
 
       result.clustersCreated++;
     }
@@ -0,0 +1,30 @@
+// ISO week helpers shared by processing and digest generation
+
+// Computed in UTC so the week doesn't depend on the server's timezone.
+export function getWeekNumber(date: Date): string {
+  const d = new Date(
+    Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), date.getUTCDate())
+  );
+  d.setUTCDate(d.getUTCDate() + 4 - (d.getUTCDay() || 7));
+  const yearStart = Date.UTC(d.getUTCFullYear(), 0, 1);
+  const weekNo = Math.ceil(((d.getTime() - yearStart) / 86400000 + 1) / 7);
+  return `${d.getUTCFullYear()}-W${weekNo.toString().padStart(2, "0")}`;
+}
+
+// Monday 00:00 to Sunday 23:59:59.999 UTC of an ISO week. Week 1 is the
+// week containing January 4th, which also handles years with a week 53.
+export function getWeekDateRange(weekNumber: string): {
+  start: Date;
+  end: Date;
+} {
+  const [year, week] = weekNumber.split("-W").map(Number);
+  const jan4 = new Date(Date.UTC(year, 0, 4));
+  const start = new Date(jan4);
+  start.setUTCDate(
+    jan4.getUTCDate() - ((jan4.getUTCDay() + 6) % 7) + (week - 1) * 7
+  );
+  const end = new Date(start);
+  end.setUTCDate(end.getUTCDate() + 6);
+  end.setUTCHours(23, 59, 59, 999);
+  return { start, end };
+}